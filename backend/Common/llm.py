@@ -0,0 +1,231 @@
+"""
+Shared gateway for every LLM (Gemini) call made by the backend.
+
+Model handles are created once per (model name, generation config) and reused
+across requests instead of being rebuilt per request or per module. Every call
+goes through a per-process concurrency limit and a token-bucket rate limit, is
+retried with jittered exponential backoff on quota / availability errors, and
+is recorded in per call site metrics (see stats()).
+
+The backend behind the gateway is pluggable (see Common/llm_providers.py):
+LLM_PROVIDER=gemini (default) or LLM_PROVIDER=fake for offline load tests and
+benchmarks.
+
+Usage:
+    from Common import llm
+
+    model = llm.get_model("gemini-1.5-flash", {"temperature": 0.7})
+    response = model.generate_content(prompt, site="topic")
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from Common import tracing
+from Common.llm_providers import create_provider
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+RATE_LIMIT_PER_SECOND = float(os.getenv("LLM_RATE_LIMIT", "10"))
+RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_BURST", "20"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30.0"))
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_provider = create_provider(LLM_PROVIDER)
+_configured_key = None
+_models: Dict[tuple, "GatewayModel"] = {}
+_models_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_bucket = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+_stats: Dict[str, Dict[str, Any]] = {}
+_stats_lock = threading.Lock()
+
+LLM_ERRORS = tracing.counter("backend_llm_errors_total", "LLM calls that failed after all retries")
+LLM_RETRIES = tracing.counter("backend_llm_retries_total", "LLM call attempts retried after quota / server errors")
+
+
+def set_provider(provider) -> None:
+    """Swap the active provider (a name from llm_providers.PROVIDERS or an instance)."""
+    global _provider, _configured_key
+    _provider = create_provider(provider) if isinstance(provider, str) else provider
+    if _configured_key:
+        _provider.configure(_configured_key)
+
+
+def get_provider():
+    return _provider
+
+
+def requires_api_key() -> bool:
+    """False when the active provider runs offline and needs no credentials."""
+    return _provider.requires_api_key
+
+
+def configure(api_key: Optional[str]) -> None:
+    """Configure the provider client, skipping repeat calls with the same key."""
+    global _configured_key
+    if api_key and api_key != _configured_key:
+        _provider.configure(api_key)
+        _configured_key = api_key
+
+
+def get_model(model_name: str = "gemini-1.5-flash",
+              generation_config: Optional[Dict[str, Any]] = None) -> "GatewayModel":
+    """Return the shared handle for this model name and generation config."""
+    key = (model_name, json.dumps(generation_config or {}, sort_keys=True))
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = GatewayModel(model_name, generation_config)
+            _models[key] = model
+        return model
+
+
+def _record(site: str, elapsed: float, error: bool = False, retries: int = 0, usage=None) -> None:
+    tracing.record(f"llm.{site}", elapsed)
+    if error:
+        LLM_ERRORS.inc(site=site)
+    if retries:
+        LLM_RETRIES.inc(retries, site=site)
+    with _stats_lock:
+        entry = _stats.setdefault(site, {
+            "calls": 0, "errors": 0, "retries": 0,
+            "total_seconds": 0.0, "max_seconds": 0.0,
+            "prompt_tokens": 0, "output_tokens": 0,
+        })
+        entry["calls"] += 1
+        entry["errors"] += int(error)
+        entry["retries"] += retries
+        entry["total_seconds"] += elapsed
+        entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+        if usage is not None:
+            entry["prompt_tokens"] += getattr(usage, "prompt_token_count", 0) or 0
+            entry["output_tokens"] += getattr(usage, "candidates_token_count", 0) or 0
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Per call site counters, latency and token usage since process start."""
+    with _stats_lock:
+        result = {}
+        for site, entry in _stats.items():
+            result[site] = dict(entry)
+            result[site]["avg_seconds"] = entry["total_seconds"] / entry["calls"] if entry["calls"] else 0.0
+        return result
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Full jitter: uniform in [0, base * 2^attempt], capped
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+class GatewayModel:
+    """Drop-in wrapper around genai.GenerativeModel.generate_content."""
+
+    def __init__(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None):
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self._provider = None
+        self._handle = None
+
+    def _resolve(self):
+        # Handles are created lazily and rebuilt if the provider is swapped,
+        # so module-level models keep working after set_provider()
+        provider = _provider
+        if self._provider is not provider:
+            self._handle = provider.create_model(self.model_name, self.generation_config)
+            self._provider = provider
+        return provider, self._handle
+
+    def generate_content(self, contents, site: str = "default", stream: bool = False, **kwargs):
+        if stream:
+            return self._generate_stream(contents, site, **kwargs)
+
+        provider, handle = self._resolve()
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            _bucket.acquire()
+            try:
+                with _slots:
+                    response = provider.generate(handle, contents, site, **kwargs)
+                _record(site, time.perf_counter() - start, retries=attempt,
+                        usage=getattr(response, "usage_metadata", None))
+                return response
+            except provider.retryable_errors:
+                if attempt >= MAX_RETRIES:
+                    _record(site, time.perf_counter() - start, error=True, retries=attempt)
+                    raise
+                time.sleep(_backoff_delay(attempt))
+                attempt += 1
+            except Exception:
+                _record(site, time.perf_counter() - start, error=True, retries=attempt)
+                raise
+
+    def _generate_stream(self, contents, site: str, **kwargs):
+        """
+        Generator over response chunks. The concurrency slot is held until the
+        stream is exhausted or closed; only the initial request is retried.
+        """
+        provider, handle = self._resolve()
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            _bucket.acquire()
+            _slots.acquire()
+            try:
+                response = provider.generate(handle, contents, site, stream=True, **kwargs)
+                break
+            except provider.retryable_errors:
+                _slots.release()
+                if attempt >= MAX_RETRIES:
+                    _record(site, time.perf_counter() - start, error=True, retries=attempt)
+                    raise
+                time.sleep(_backoff_delay(attempt))
+                attempt += 1
+            except Exception:
+                _slots.release()
+                _record(site, time.perf_counter() - start, error=True, retries=attempt)
+                raise
+
+        usage = None
+        error = False
+        try:
+            for chunk in response:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                yield chunk
+        except Exception:
+            error = True
+            raise
+        finally:
+            _slots.release()
+            _record(site, time.perf_counter() - start, error=error, retries=attempt, usage=usage)
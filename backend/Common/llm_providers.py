@@ -0,0 +1,222 @@
+"""
+LLM providers behind the gateway in Common/llm.py.
+
+GeminiProvider  talks to google.generativeai (the default).
+FakeProvider    deterministic local stand-in for load tests and benchmarks. It
+                never touches the network: output is derived from a hash of the
+                prompt, latency and token rate are configurable, and streaming
+                yields word-sized chunks at the configured rate.
+
+A provider exposes:
+    name                   short identifier used in logs / metrics
+    requires_api_key       whether callers must supply credentials
+    retryable_errors       exception types the gateway should retry
+    configure(api_key)
+    create_model(model_name, generation_config) -> provider-specific handle
+    generate(handle, contents, site, stream=False, **kwargs)
+        -> response with .text and .usage_metadata, or an iterator of such
+           chunks when stream=True
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class GeminiProvider:
+    name = "gemini"
+    requires_api_key = True
+
+    def __init__(self):
+        import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
+
+        self._genai = genai
+        # Quota exhaustion and transient server-side failures
+        self.retryable_errors = (
+            google_exceptions.ResourceExhausted,
+            google_exceptions.TooManyRequests,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.InternalServerError,
+        )
+
+    def configure(self, api_key: str) -> None:
+        self._genai.configure(api_key=api_key)
+
+    def create_model(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None):
+        return self._genai.GenerativeModel(model_name, generation_config=generation_config)
+
+    def generate(self, handle, contents, site: str, stream: bool = False, **kwargs):
+        if stream:
+            return handle.generate_content(contents, stream=True, **kwargs)
+        return handle.generate_content(contents, **kwargs)
+
+
+class FakeUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeResponse:
+    """Mimics the parts of GenerateContentResponse the backend relies on."""
+
+    def __init__(self, text: str, usage_metadata: Optional[FakeUsage] = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+    def __iter__(self):
+        # A non-streamed Gemini response iterates as a single chunk
+        return iter([self])
+
+
+def _prompt_text(contents) -> str:
+    """Flatten prompt contents, skipping inline binary parts such as images."""
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(part for part in contents if isinstance(part, str))
+    return str(contents)
+
+
+def _count_tokens(text: str) -> int:
+    return len(text.split())
+
+
+_WORDS = ("the", "system", "learns", "energy", "simple", "idea", "students", "light",
+          "water", "process", "important", "because", "helps", "explains", "example",
+          "shows", "we", "can", "use", "every", "day", "key", "point", "about")
+
+
+def _sentences(rng: random.Random, count: int, words_per_sentence: int = 12) -> str:
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(_WORDS) for _ in range(words_per_sentence)]
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def _default_responder(prompt: str, rng: random.Random, output_tokens: int) -> str:
+    return _sentences(rng, max(1, output_tokens // 12))
+
+
+def _mcq_responder(prompt: str, rng: random.Random, output_tokens: int) -> str:
+    count = re.search(r"Generate (\d+)", prompt)
+    topic = re.search(r"^\s*Topic: (.+)$", prompt, re.MULTILINE)
+    questions = []
+    for i in range(int(count.group(1)) if count else 10):
+        questions.append({
+            "topic": topic.group(1).strip() if topic else f"Topic {i // 2 + 1}",
+            "question": f"Question {i + 1}: {_sentences(rng, 1, 8)[:-1]}?",
+            "options": [_sentences(rng, 1, 3)[:-1] for _ in range(4)],
+            "correct_answer": rng.choice("ABCD"),
+        })
+    return json.dumps(questions, indent=4)
+
+
+def _mcq_topics_responder(prompt: str, rng: random.Random, output_tokens: int) -> str:
+    count = re.search(r"List (\d+)", prompt)
+    return json.dumps([f"Topic {i + 1} {_sentences(rng, 1, 2)[:-1].lower()}"
+                       for i in range(int(count.group(1)) if count else 5)])
+
+
+def _slide_batch_responder(prompt: str, rng: random.Random, output_tokens: int) -> str:
+    slide_numbers = re.findall(r"^Slide (\d+):", prompt, re.MULTILINE)
+    return json.dumps({number: _sentences(rng, max(1, output_tokens // 12)) for number in slide_numbers})
+
+
+def _scene_responder(prompt: str, rng: random.Random, output_tokens: int) -> str:
+    return (
+        f"Scene Description: {_sentences(rng, 2)} There is a lamp in this scene. "
+        "Do you want to learn about it?\n"
+        f"Learning: {_sentences(rng, max(1, output_tokens // 12))}"
+    )
+
+
+class FakeProvider:
+    """
+    Deterministic offline provider.
+
+    FAKE_LLM_LATENCY            seconds before the first token (default 0.5)
+    FAKE_LLM_TOKENS_PER_SECOND  output rate after the first token (default 200, 0 = instant)
+    FAKE_LLM_OUTPUT_TOKENS      approximate length of free-text answers (default 80)
+    """
+    name = "fake"
+    requires_api_key = False
+    retryable_errors = ()
+
+    def __init__(self,
+                 latency: Optional[float] = None,
+                 tokens_per_second: Optional[float] = None,
+                 output_tokens: Optional[int] = None):
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_LLM_LATENCY", "0.5"))
+        self.tokens_per_second = (tokens_per_second if tokens_per_second is not None
+                                  else float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "200")))
+        self.output_tokens = (output_tokens if output_tokens is not None
+                              else int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "80")))
+        self.responders: Dict[str, Callable[[str, random.Random, int], str]] = {
+            "mcq": _mcq_responder,
+            "mcq_topic": _mcq_responder,
+            "mcq_topics": _mcq_topics_responder,
+            "scene_description": _scene_responder,
+            "ppt_script_batch": _slide_batch_responder,
+        }
+
+    def register_responder(self, site: str, responder: Callable[[str, random.Random, int], str]) -> None:
+        """Override the canned output for one call site: responder(prompt, rng, output_tokens) -> str."""
+        self.responders[site] = responder
+
+    def configure(self, api_key: str) -> None:
+        pass
+
+    def create_model(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None):
+        return {"model_name": model_name, "generation_config": generation_config or {}}
+
+    def _render(self, handle, contents, site: str) -> Tuple[str, str]:
+        prompt = _prompt_text(contents)
+        seed = hashlib.sha256(f"{handle['model_name']}|{site}|{prompt}".encode("utf-8")).hexdigest()
+        rng = random.Random(seed)
+        responder = self.responders.get(site, _default_responder)
+        return prompt, responder(prompt, rng, self.output_tokens)
+
+    def generate(self, handle, contents, site: str, stream: bool = False, **kwargs):
+        prompt, text = self._render(handle, contents, site)
+        if stream:
+            return self._stream(prompt, text)
+
+        time.sleep(self.latency)
+        if self.tokens_per_second > 0:
+            time.sleep(_count_tokens(text) / self.tokens_per_second)
+        return FakeResponse(text, FakeUsage(_count_tokens(prompt), _count_tokens(text)))
+
+    def _stream(self, prompt: str, text: str):
+        time.sleep(self.latency)
+        words: List[str] = text.split(" ")
+        chunk_size = 8
+        prompt_tokens = _count_tokens(prompt)
+        emitted = 0
+        for start in range(0, len(words), chunk_size):
+            chunk = " ".join(words[start:start + chunk_size])
+            if start + chunk_size < len(words):
+                chunk += " "
+            if self.tokens_per_second > 0:
+                time.sleep(_count_tokens(chunk) / self.tokens_per_second)
+            emitted += _count_tokens(chunk)
+            yield FakeResponse(chunk, FakeUsage(prompt_tokens, emitted))
+
+
+PROVIDERS = {
+    "gemini": GeminiProvider,
+    "fake": FakeProvider,
+}
+
+
+def create_provider(name: str):
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider: {name} (expected one of {', '.join(PROVIDERS)})")
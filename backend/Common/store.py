@@ -0,0 +1,101 @@
+"""
+Small persistent key/value store on SQLite, for caches that should survive
+restarts and be shared by every worker process on the host.
+
+    from Common.store import KeyValueStore
+
+    scripts = KeyValueStore("slide_scripts")
+    scripts.set(key, {"script": text}, ttl=86400)
+    scripts.get(key)  # -> {"script": text}, or None once expired / missing
+
+Values are stored as JSON. Each store is its own table in STORE_PATH.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, Optional, Tuple
+
+STORE_PATH = os.getenv("STORE_PATH", os.path.join("data", "store.sqlite3"))
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def connect(path: Optional[str] = None):
+    """One shared connection (and lock) per database file, for modules that need their own tables."""
+    path = path or STORE_PATH
+    with _connections_lock:
+        if path not in _connections:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            _connections[path] = (connection, threading.Lock())
+        return _connections[path]
+
+
+class KeyValueStore:
+    def __init__(self, table: str, path: Optional[str] = None, ttl: Optional[float] = None):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.table = table
+        self.ttl = ttl
+        self.connection, self.lock = connect(path)
+        with self.lock:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, updated_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self.lock:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Live (non-expired) entries, most recently updated first."""
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT key, value FROM {self.table} WHERE expires_at IS NULL OR expires_at >= ? "
+                "ORDER BY updated_at DESC", (time.time(),)
+            ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def purge_expired(self) -> int:
+        with self.lock:
+            cursor = self.connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
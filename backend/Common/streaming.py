@@ -0,0 +1,50 @@
+"""
+Helpers for forwarding streamed LLM output to clients.
+
+    response = model.generate_content(prompt, site="topic_response", stream=True)
+    for sentence in streaming.sentences(streaming.iter_text(response)):
+        ...
+
+sentences() regroups arbitrary text chunks into sentence-sized pieces, so a
+client reading answers aloud can start speaking after the first sentence
+instead of waiting for the whole response.
+"""
+import re
+from typing import Iterable, Iterator
+
+# Sentence end (optionally followed by closing quotes / brackets) then whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+# Very short sentences ("Sure!") are merged with the next one
+MIN_SENTENCE_CHARS = 20
+
+
+def iter_text(chunks) -> Iterator[str]:
+    """Text of each streamed response chunk, skipping chunks without text (e.g. safety metadata)."""
+    for chunk in chunks:
+        try:
+            text = chunk.text
+        except ValueError:
+            continue
+        if text:
+            yield text
+
+
+def sentences(chunks: Iterable[str], min_length: int = MIN_SENTENCE_CHARS) -> Iterator[str]:
+    """Regroup text chunks into stripped sentences of at least min_length characters."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        search_from = 0
+        while True:
+            match = SENTENCE_BOUNDARY.search(buffer, search_from)
+            if match is None:
+                break
+            sentence = buffer[:match.end()].strip()
+            if len(sentence) >= min_length:
+                yield sentence
+                buffer = buffer[match.end():]
+                search_from = 0
+            else:
+                search_from = match.end()
+    if buffer.strip():
+        yield buffer.strip()
@@ -0,0 +1,197 @@
+"""
+Lightweight timing instrumentation for the backend.
+
+    from Common import tracing
+
+    with tracing.span("rag.embed"):
+        ...
+
+    @tracing.timed("ppt.render")
+    def slide_to_image(...): ...
+
+Every span is observed into a process-wide histogram (labelled by stage) and,
+while a request is being handled, appended to that request's trace. The Flask
+integration (init_app) exposes everything in Prometheus text format on /metrics
+and, when enabled, reports the request's stages in a Server-Timing header:
+
+TIMING_HEADERS=1        add Server-Timing to every response
+X-Timing: 1             (request header) add it for this request only
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+TIMING_HEADERS = os.getenv("TIMING_HEADERS", "0").lower() in ("1", "true", "yes")
+
+# Prometheus' default buckets, stretched for multi-second LLM and TTS stages
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key, extra=None) -> str:
+    pairs = list(label_key) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', repr(bound))])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+_registry: Dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def histogram(name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = Histogram(name, help_text, buckets)
+        return _registry[name]
+
+
+def counter(name: str, help_text: str) -> Counter:
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = Counter(name, help_text)
+        return _registry[name]
+
+
+STAGE_DURATION = histogram("backend_stage_duration_seconds", "Time spent in instrumented pipeline stages")
+REQUEST_DURATION = histogram("backend_request_duration_seconds", "HTTP request handling time (until headers are sent)")
+
+# (stage, seconds) pairs recorded while handling the current request
+_current_trace: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "current_trace", default=None)
+
+
+def record(stage: str, seconds: float) -> None:
+    """Record a stage duration measured elsewhere."""
+    STAGE_DURATION.observe(seconds, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed(stage: str):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_prometheus() -> str:
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def server_timing(trace: List[Tuple[str, float]], total: float) -> str:
+    # Repeated stages (e.g. one LLM call per slide) are summed into one entry
+    totals: Dict[str, float] = {}
+    for stage, seconds in trace:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    entries = [f"{stage.replace(' ', '_')};dur={seconds * 1000:.1f}" for stage, seconds in totals.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def init_app(app) -> None:
+    """Start a trace per request, time it, and serve /metrics."""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_trace():
+        g.trace_start = time.perf_counter()
+        _current_trace.set([])
+
+    @app.after_request
+    def _finish_trace(response):
+        start = g.get("trace_start")
+        if start is None:
+            return response
+        total = time.perf_counter() - start
+        REQUEST_DURATION.observe(total, endpoint=request.endpoint or "unknown",
+                                 method=request.method, status=response.status_code)
+        if TIMING_HEADERS or request.headers.get("X-Timing") == "1":
+            response.headers["Server-Timing"] = server_timing(_current_trace.get() or [], total)
+        return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,160 @@
+"""
+Text-to-speech engines for slide voiceovers, selected per deployment:
+
+TTS_ENGINE=gtts     Google Translate TTS over the network (the default), MP3
+TTS_ENGINE=espeak   espeak-ng synthesised locally and encoded with ffmpeg;
+                    no network, TTS_FORMAT=mp3 or opus (Ogg Opus)
+TTS_ENGINE=silent   silent WAV whose length follows the word count; for
+                    benchmarks and offline tests
+
+    from Common import tts
+
+    engine = tts.get_engine()
+    tts.synthesize(text, f"{name}.{engine.extension}")
+
+An engine exposes:
+    name
+    voice_id     identifies engine, voice and output settings; part of cache keys
+    extension    file extension of what synthesize() writes
+    synthesize(text, path)
+
+espeak-ng and ffmpeg run as child processes, so several slides are synthesised
+in parallel on separate cores; TTS_PROCESSES caps how many run at once.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+from Common import tracing
+
+TTS_ENGINE = os.getenv("TTS_ENGINE", "gtts").lower()
+TTS_LANG = os.getenv("TTS_LANG", "en")
+TTS_VOICE = os.getenv("TTS_VOICE", "en-us")
+TTS_RATE = int(os.getenv("TTS_RATE", "160"))  # espeak-ng words per minute
+TTS_FORMAT = os.getenv("TTS_FORMAT", "mp3").lower()
+TTS_BITRATE = os.getenv("TTS_BITRATE", "32k")
+TTS_PROCESSES = int(os.getenv("TTS_PROCESSES", str(os.cpu_count() or 2)))
+
+logger = logging.getLogger(__name__)
+
+TTS_ERRORS = tracing.counter("backend_tts_errors_total", "Voiceover synthesis failures by engine")
+
+
+class GTTSEngine:
+    name = "gtts"
+    extension = "mp3"
+
+    def __init__(self, lang: str = TTS_LANG):
+        from gtts import gTTS
+
+        self._gtts = gTTS
+        self.lang = lang
+        self.voice_id = f"gtts:{lang}"
+
+    def synthesize(self, text: str, path: str) -> None:
+        self._gtts(text, lang=self.lang).save(path)
+
+
+class EspeakEngine:
+    name = "espeak"
+
+    # ffmpeg encoder arguments per output format
+    ENCODERS = {
+        "mp3": ("mp3", ["-codec:a", "libmp3lame", "-f", "mp3"]),
+        "opus": ("ogg", ["-codec:a", "libopus", "-application", "voip", "-f", "ogg"]),
+    }
+
+    def __init__(self, voice: str = TTS_VOICE, rate: int = TTS_RATE, audio_format: str = TTS_FORMAT,
+                 bitrate: str = TTS_BITRATE, max_processes: int = TTS_PROCESSES):
+        if audio_format not in self.ENCODERS:
+            raise ValueError(f"Unsupported TTS_FORMAT {audio_format!r}, expected one of {sorted(self.ENCODERS)}")
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.ffmpeg = shutil.which("ffmpeg")
+        if not self.espeak or not self.ffmpeg:
+            raise RuntimeError("TTS_ENGINE=espeak needs espeak-ng and ffmpeg on PATH")
+        self.voice = voice
+        self.rate = rate
+        self.bitrate = bitrate
+        self.extension, self.codec_args = self.ENCODERS[audio_format]
+        self.voice_id = f"espeak:{voice}:{rate}:{audio_format}:{bitrate}"
+        self._slots = threading.BoundedSemaphore(max_processes)
+
+    def synthesize(self, text: str, path: str) -> None:
+        with self._slots:
+            wav = subprocess.run(
+                [self.espeak, "-v", self.voice, "-s", str(self.rate), "--stdout", "--stdin"],
+                input=text.encode("utf-8"), capture_output=True, check=True,
+            ).stdout
+            subprocess.run(
+                [self.ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-f", "wav", "-i", "pipe:0",
+                 *self.codec_args, "-b:a", self.bitrate, path],
+                input=wav, capture_output=True, check=True,
+            )
+
+
+class SilentEngine:
+    name = "silent"
+    extension = "wav"
+    voice_id = "silent"
+
+    SAMPLE_RATE = 8000
+    WORDS_PER_SECOND = 2.5
+
+    def synthesize(self, text: str, path: str) -> None:
+        seconds = max(1.0, len(text.split()) / self.WORDS_PER_SECOND)
+        with wave.open(path, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.SAMPLE_RATE)
+            out.writeframes(b"\x00\x00" * int(seconds * self.SAMPLE_RATE))
+
+
+ENGINES = {
+    "gtts": GTTSEngine,
+    "espeak": EspeakEngine,
+    "silent": SilentEngine,
+}
+
+
+def create_engine(name: str):
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown TTS_ENGINE {name!r}, expected one of {sorted(ENGINES)}") from None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The deployment's engine, created on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_engine(TTS_ENGINE)
+            logger.info("TTS engine: %s (%s)", _engine.name, _engine.voice_id)
+        return _engine
+
+
+def set_engine(engine) -> None:
+    """Swap the active engine (a name from ENGINES or an instance)."""
+    global _engine
+    with _engine_lock:
+        _engine = create_engine(engine) if isinstance(engine, str) else engine
+
+
+def synthesize(text: str, path: str) -> None:
+    engine = get_engine()
+    start = time.perf_counter()
+    try:
+        engine.synthesize(text, path)
+    except Exception:
+        TTS_ERRORS.inc(engine=engine.name)
+        raise
+    finally:
+        tracing.record(f"tts.{engine.name}", time.perf_counter() - start)
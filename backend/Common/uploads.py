@@ -0,0 +1,126 @@
+"""
+Streaming file uploads for the Flask app.
+
+By default Werkzeug spools uploaded files into anonymous temporary files, and
+FileStorage.save() then copies them a second time. With init_app(app), each
+uploaded file is instead written straight into UPLOAD_TMP_FOLDER while the
+body is parsed, SHA-256 hashed chunk by chunk on the way, and save_upload()
+only has to rename it into place and return the digest (decks are keyed by it,
+see PPTtoVideo/storage.py).
+
+limit_upload() gives an endpoint its own body limit. A request whose
+Content-Length is over the limit is rejected with 413 before any of the body is
+read; a body without a length is cut off as soon as it crosses it.
+
+    @app.route('/api/upload', methods=['POST'])
+    @uploads.limit_upload(50 * 1024 * 1024)
+    def upload():
+        sha256, size = uploads.save_upload(request.files['file'], path)
+"""
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Tuple
+
+from flask import Request, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from Common import tracing
+
+UPLOAD_TMP_FOLDER = os.getenv("UPLOAD_TMP_FOLDER", os.path.join("uploads", ".incoming"))
+CHUNK_SIZE = 1024 * 1024
+
+UPLOADS_REJECTED = tracing.counter("backend_uploads_rejected_total", "Uploads refused for exceeding the endpoint limit")
+UPLOAD_BYTES = tracing.counter("backend_upload_bytes_total", "Bytes received in uploaded files")
+
+
+class HashingFile:
+    """Temporary upload file that hashes everything written to it."""
+
+    def __init__(self, folder: str = UPLOAD_TMP_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+        self.file = os.fdopen(fd, "w+b")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.claimed = False
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def claim(self, path: str) -> Tuple[str, int]:
+        """Move the finished upload to path; returns (sha256 hex digest, size)."""
+        self.file.close()
+        try:
+            os.replace(self.path, path)
+        except OSError:
+            # e.g. destination on another filesystem
+            shutil.move(self.path, path)
+        self.claimed = True
+        UPLOAD_BYTES.inc(self.size)
+        return self.digest.hexdigest(), self.size
+
+    def close(self) -> None:
+        self.file.close()
+        if not self.claimed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getattr__(self, name):
+        # read / seek / tell / flush for Werkzeug and FileStorage
+        return getattr(self.file, name)
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = HashingFile()
+        # Tracked here too: a body cut off mid-parse never reaches request.files
+        self.__dict__.setdefault("_upload_files", []).append(stream)
+        return stream
+
+    def close(self) -> None:
+        super().close()
+        for stream in self.__dict__.get("_upload_files", ()):
+            stream.close()
+
+
+def init_app(app) -> None:
+    app.request_class = UploadRequest
+
+
+def save_upload(upload, path: str) -> Tuple[str, int]:
+    """Store an uploaded FileStorage at path; returns (sha256 hex digest, size)."""
+    if isinstance(upload.stream, HashingFile):
+        return upload.stream.claim(path)
+
+    # Not parsed by UploadRequest: copy while hashing
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as out:
+        for chunk in iter(lambda: upload.stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+            out.write(chunk)
+    UPLOAD_BYTES.inc(size)
+    return digest.hexdigest(), size
+
+
+def limit_upload(max_bytes: int):
+    """Reject request bodies over max_bytes with 413 before the view runs."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request.max_content_length = max_bytes
+            try:
+                # Parse now, so an oversized body fails here and not inside the view
+                request.files
+            except RequestEntityTooLarge:
+                UPLOADS_REJECTED.inc(endpoint=request.endpoint or "unknown")
+                message = f"File too large, the limit is {max_bytes / (1024 * 1024):g} MB"
+                return jsonify({"success": False, "error": message, "message": message}), 413
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
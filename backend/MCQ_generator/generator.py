@@ -0,0 +1,310 @@
+"""
+Chapter quizzes: served from the question bank, generated by Gemini only when
+the bank cannot cover the request yet.
+
+Generation fans out. One call lists MCQ_TOPICS_PER_CHAPTER topics for the
+chapter, and that list is cached per chapter. Then each topic gets its own call
+for MCQ_QUESTIONS_PER_TOPIC questions, all in parallel. The merged, de-duplicated
+questions make the quiz, so wall time is bounded by the slowest topic. A
+malformed or short answer only retries that topic, at most MCQ_TOPIC_RETRIES
+times. Requests use Gemini's JSON mode with a response schema, and answers are
+parsed incrementally (see MCQ_generator/parsing.py), so every complete, valid
+question is kept even when the rest of the answer is broken.
+
+stream_quiz() is the streaming form of get_quiz(): questions are streamed out
+of each topic's answer as soon as they parse, so the first question is ready
+long before the whole quiz is.
+
+get_quiz() samples the bank first. Only when a chapter has fewer questions than
+the quiz needs does it generate on the request path. Either way, a chapter with
+fewer than MCQ_BANK_TARGET banked questions gets a background top-up (one at a
+time per chapter), so later students are served from the bank.
+"""
+import contextvars
+import logging
+import os
+import queue
+import threading
+from concurrent import futures
+
+from Common import llm, streaming, tracing
+from Common.store import KeyValueStore
+from MCQ_generator import parsing
+from MCQ_generator.question_bank import bank, fingerprint, normalise_name
+
+MCQ_QUIZ_SIZE = 10
+MCQ_TOPICS_PER_CHAPTER = int(os.getenv('MCQ_TOPICS_PER_CHAPTER', '5'))
+MCQ_QUESTIONS_PER_TOPIC = int(os.getenv('MCQ_QUESTIONS_PER_TOPIC', '2'))
+# Extra attempts for one topic whose answer was malformed or short
+MCQ_TOPIC_RETRIES = int(os.getenv('MCQ_TOPIC_RETRIES', '2'))
+# Questions to keep banked per chapter before background top-ups stop
+MCQ_BANK_TARGET = int(os.getenv('MCQ_BANK_TARGET', '60'))
+# Banked questions per topic listed in the prompt as ones not to repeat
+MCQ_AVOID_QUESTIONS = int(os.getenv('MCQ_AVOID_QUESTIONS', '10'))
+
+QUIZZES = tracing.counter("backend_mcq_quizzes_total", "MCQ quizzes served, by source (bank or generated)")
+TOPIC_RETRIES = tracing.counter("backend_mcq_topic_retries_total",
+                                "Per-topic MCQ requests repeated after a malformed or short answer")
+
+logger = logging.getLogger(__name__)
+
+# Chapter -> its topic list; topics rarely change, so keep them for a month
+chapter_topics_cache = KeyValueStore("mcq_chapter_topics",
+                                     ttl=float(os.getenv('MCQ_TOPICS_CACHE_TTL', str(30 * 24 * 3600))))
+
+_fanout_pool = futures.ThreadPoolExecutor(max_workers=int(os.getenv('MCQ_FANOUT_WORKERS', '10')),
+                                          thread_name_prefix="mcq-fanout")
+_top_up_pool = futures.ThreadPoolExecutor(max_workers=int(os.getenv('MCQ_TOP_UP_WORKERS', '2')),
+                                          thread_name_prefix="mcq-top-up")
+# normalised chapter -> in-flight top-up future
+_topping_up = {}
+_topping_up_lock = threading.Lock()
+
+
+class MCQGenerator:
+    def __init__(self):
+        # Schema-constrained JSON output
+        self.model = llm.get_model("gemini-1.5-flash", {
+            "response_mime_type": "application/json",
+            "response_schema": parsing.QUESTIONS_SCHEMA,
+        })
+        self.topics_model = llm.get_model("gemini-1.5-flash", {
+            "response_mime_type": "application/json",
+            "response_schema": parsing.TOPICS_SCHEMA,
+        })
+
+    def chapter_topics(self, chapter_name):
+        """MCQ_TOPICS_PER_CHAPTER important topics of the chapter, cached per chapter."""
+        key = normalise_name(chapter_name)
+        cached = chapter_topics_cache.get(key)
+        if cached:
+            return cached
+        prompt = f"""List {MCQ_TOPICS_PER_CHAPTER} important, distinct topics from the chapter: {chapter_name}.
+        Reply with a JSON array of short topic names only, e.g. ["Topic one", "Topic two"]
+        """
+        try:
+            response = self.topics_model.generate_content(prompt, site="mcq_topics")
+            listed = parsing.parse_string_list(response.text)
+        except Exception as e:
+            logger.warning(f"Could not list topics for {chapter_name!r}: {e}")
+            listed = []
+        topics = []
+        for topic in listed:
+            if normalise_name(topic) not in map(normalise_name, topics):
+                topics.append(topic)
+        topics = topics[:MCQ_TOPICS_PER_CHAPTER]
+        if topics:
+            chapter_topics_cache.set(key, topics)
+            return topics
+        # Fall back to the topics already banked for this chapter, if any
+        return bank.topics(chapter_name)
+
+    def topic_prompt(self, chapter_name, topic, count, avoid=()):
+        avoid_block = ""
+        if avoid:
+            listed = "\n".join(f"- {question}" for question in avoid)
+            avoid_block = f"\n        Do not repeat any of these existing questions:\n{listed}\n"
+        return f"""Generate {count} multiple-choice questions for the chapter: {chapter_name}.
+        Topic: {topic}
+        Strictly follow this JSON format:
+        [
+            {{
+                "topic": "{topic}",
+                "question": "Question text",
+                "options": ["Option A", "Option B", "Option C", "Option D"],
+                "correct_answer": "A or B or C or D"
+            }},
+            ...
+        ]
+        Ensure:
+        - Every question is about {topic}
+        - Options are plausible
+        - Correct answer is clearly marked
+        {avoid_block}"""
+
+    def generate_topic_questions(self, chapter_name, topic, count, avoid=(), on_question=None):
+        """
+        Up to `count` valid questions on one topic, each also passed to
+        on_question() as soon as it has been parsed from the answer stream.
+        Valid questions from a broken answer are kept, and a retry only asks
+        for the ones still missing.
+        """
+        collected, seen = [], set()
+        for attempt in range(1 + MCQ_TOPIC_RETRIES):
+            needed = count - len(collected)
+            if needed <= 0:
+                break
+            if attempt:
+                TOPIC_RETRIES.inc()
+            prompt = self.topic_prompt(chapter_name, topic, needed,
+                                       list(avoid) + [q['question'] for q in collected])
+            try:
+                response = self.model.generate_content(prompt, site="mcq_topic", stream=True)
+                for q in parsing.iter_questions(streaming.iter_text(response)):
+                    key = normalise_name(q['question'])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    q['topic'] = topic
+                    collected.append(q)
+                    if on_question:
+                        on_question(q)
+                    if len(collected) >= count:
+                        break
+            except Exception as e:
+                # Questions parsed before the failure are kept
+                logger.warning(f"MCQ topic {topic!r} of {chapter_name!r} failed: {e}")
+        return collected[:count]
+
+    def generate_questions(self, chapter_name, count=MCQ_QUIZ_SIZE, avoid_per_topic=0, on_question=None):
+        """
+        Raw questions ({topic, question, options, correct_answer}) for a chapter,
+        one parallel request per topic. With avoid_per_topic, each request lists
+        that many of the topic's banked questions as ones not to repeat.
+        on_question() is called from the worker threads as each question parses.
+        """
+        topics = self.chapter_topics(chapter_name)
+        if not topics:
+            # No topic list at all: ask for the whole quiz in one piece
+            topics, per_topic = [chapter_name], count
+        else:
+            per_topic = max(MCQ_QUESTIONS_PER_TOPIC, -(-count // len(topics)))
+
+        def generate(topic):
+            avoid = bank.questions(chapter_name, avoid_per_topic, topic=topic) if avoid_per_topic else ()
+            return self.generate_topic_questions(chapter_name, topic, per_topic, avoid, on_question)
+
+        pieces = [_fanout_pool.submit(contextvars.copy_context().run, generate, topic) for topic in topics]
+
+        merged, seen = [], set()
+        for piece in pieces:
+            for q in piece.result():
+                key = fingerprint(chapter_name, q['question'])
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(q)
+        if not merged:
+            raise ValueError(f"Could not generate questions for chapter: {chapter_name}")
+        return merged
+
+    def generate_mcq_for_chapter(self, chapter_name):
+        return number_questions(self.generate_questions(chapter_name))
+
+
+generator = MCQGenerator()
+
+
+def number_question(q, number):
+    """The client's answer key format."""
+    return {
+        "question_number": number,
+        "question": q['question'],
+        "options": q['options'],
+        "correct_answer_option": q['correct_answer']
+    }
+
+
+def number_questions(questions):
+    return [number_question(q, i) for i, q in enumerate(questions, 1)]
+
+
+def generate_into_bank(chapter_name, on_question=None):
+    """A fan-out of new questions, steered away from the banked ones; returns them all."""
+    questions = generator.generate_questions(chapter_name, avoid_per_topic=MCQ_AVOID_QUESTIONS,
+                                             on_question=on_question)
+    added = bank.add(chapter_name, questions)
+    logger.info(f"MCQ bank: {added}/{len(questions)} new questions for {chapter_name!r}")
+    return questions
+
+
+def _top_up(chapter_name):
+    try:
+        generate_into_bank(chapter_name)
+    except Exception as e:
+        logger.warning(f"MCQ bank top-up failed for {chapter_name!r}: {e}")
+
+
+def schedule_top_up(chapter_name):
+    """Generate more questions in the background if the chapter is below MCQ_BANK_TARGET."""
+    key = normalise_name(chapter_name)
+    with _topping_up_lock:
+        if key in _topping_up or bank.count(chapter_name) >= MCQ_BANK_TARGET:
+            return None
+        future = _top_up_pool.submit(_top_up, chapter_name)
+        _topping_up[key] = future
+
+    def forget(_):
+        with _topping_up_lock:
+            _topping_up.pop(key, None)
+
+    future.add_done_callback(forget)
+    return future
+
+
+def wait_for_top_ups(timeout=None):
+    """Block until in-flight top-ups finish (tests and benchmarks)."""
+    with _topping_up_lock:
+        pending = list(_topping_up.values())
+    futures.wait(pending, timeout=timeout)
+
+
+def get_quiz(chapter_name, count=MCQ_QUIZ_SIZE):
+    """A numbered quiz for the chapter and where it came from ('bank' or 'generated')."""
+    questions = bank.sample(chapter_name, count)
+    source = "bank"
+    if len(questions) < count:
+        questions = generate_into_bank(chapter_name)[:count]
+        source = "generated"
+    QUIZZES.inc(source=source)
+    schedule_top_up(chapter_name)
+    return number_questions(questions), source
+
+
+def stream_quiz(chapter_name, count=MCQ_QUIZ_SIZE):
+    """
+    (source, iterator of numbered questions). From the bank the questions are
+    all ready at once; otherwise each one is yielded as soon as it has been
+    parsed from its topic's answer, while generation carries on in the
+    background and still fills the bank if the client stops reading.
+    """
+    questions = bank.sample(chapter_name, count)
+    if len(questions) >= count:
+        QUIZZES.inc(source="bank")
+        schedule_top_up(chapter_name)
+        return "bank", iter(number_questions(questions))
+    return "generated", _stream_generated(chapter_name, count)
+
+
+def _stream_generated(chapter_name, count):
+    ready = queue.Queue()
+    finished = object()
+
+    def produce():
+        try:
+            generate_into_bank(chapter_name, on_question=ready.put)
+        except Exception as e:
+            ready.put(e)
+        finally:
+            ready.put(finished)
+        schedule_top_up(chapter_name)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(produce,),
+                     name="mcq-stream", daemon=True).start()
+
+    QUIZZES.inc(source="generated")
+    seen = set()
+    number = 0
+    while number < count:
+        item = ready.get()
+        if item is finished:
+            break
+        if isinstance(item, Exception):
+            if number == 0:
+                raise item
+            break
+        key = fingerprint(chapter_name, item['question'])
+        if key in seen:
+            continue
+        seen.add(key)
+        number += 1
+        yield number_question(item, number)
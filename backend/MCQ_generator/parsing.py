@@ -0,0 +1,159 @@
+"""
+Incremental parsing and validation of MCQ answers.
+
+iter_objects() scans text, either whole or as streamed chunks, and yields every
+complete top-level JSON object as soon as its closing brace arrives. Anything
+outside the objects (code fences, array brackets, prose, a truncated tail) is
+ignored, so a response that breaks off or goes wrong half way still gives up
+every question before the damage.
+
+validate_question() then checks each object and normalises it: four distinct
+non-empty options, with "A) ".."D) " labels removed only when all four carry
+them in order, and the correct answer as a letter A-D (answers given as "b",
+"Option B", "B)" or the option text itself are accepted).
+"""
+import json
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from Common import tracing
+
+OPTION_LETTERS = "ABCD"
+
+PARSED = tracing.counter("backend_mcq_parsed_total", "MCQ objects parsed from LLM answers, by result")
+
+# "A) ...", "b. ...", "(C) ...", "Option D: ..."
+_OPTION_LABEL = re.compile(r"^\s*(?:option\s+)?\(?([A-Da-d])\)?\s*[.):\-]\s+", re.IGNORECASE)
+_ANSWER_LETTER = re.compile(r"^\s*(?:option\s+)?\(?([A-Da-d])\)?\s*[.):]?\s*$", re.IGNORECASE)
+
+# Gemini structured output: a JSON array of question objects
+QUESTIONS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "topic": {"type": "string"},
+            "question": {"type": "string"},
+            "options": {"type": "array", "items": {"type": "string"}},
+            "correct_answer": {"type": "string", "format": "enum", "enum": list(OPTION_LETTERS)},
+        },
+        "required": ["question", "options", "correct_answer"],
+    },
+}
+TOPICS_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+
+def iter_objects(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Complete top-level JSON objects in the concatenated chunks, in order."""
+    buffer = []
+    depth = 0
+    in_string = escaped = False
+    for chunk in chunks:
+        for char in chunk:
+            if depth == 0:
+                if char == "{":
+                    depth, buffer = 1, ["{"]
+                continue
+            buffer.append(char)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        value = json.loads("".join(buffer))
+                    except json.JSONDecodeError:
+                        PARSED.inc(result="unparseable")
+                        continue
+                    if isinstance(value, dict):
+                        yield value
+
+
+def _strip_labels(options: List[str]) -> List[str]:
+    """Options without their "A) " ... "D) " labels, only if all four carry them in order."""
+    matches = [_OPTION_LABEL.match(option) for option in options]
+    if all(matches) and "".join(match.group(1).upper() for match in matches) == OPTION_LETTERS:
+        return [option[match.end():].strip() for option, match in zip(options, matches)]
+    # e.g. "C. elegans" or "A. Einstein" is an answer, not a label
+    return [option.strip() for option in options]
+
+
+def _answer_letter(answer, options: List[str]) -> Optional[str]:
+    if not isinstance(answer, str):
+        return None
+    match = _ANSWER_LETTER.match(answer)
+    if match:
+        return match.group(1).upper()
+    # The option text itself, with or without its label
+    candidates = {answer.strip().casefold(), _OPTION_LABEL.sub("", answer).strip().casefold()}
+    for letter, option in zip(OPTION_LETTERS, options):
+        if option.casefold() in candidates:
+            return letter
+    return None
+
+
+def validate_question(data: Dict) -> Optional[Dict]:
+    """The normalised question ({topic, question, options, correct_answer}), or None if unusable."""
+    question = data.get("question")
+    options = data.get("options")
+    if not isinstance(question, str) or not question.strip():
+        return None
+    if not isinstance(options, list) or len(options) != len(OPTION_LETTERS):
+        return None
+    if not all(isinstance(option, str) for option in options):
+        return None
+    options = _strip_labels(options)
+    if not all(options) or len({option.casefold() for option in options}) != len(options):
+        return None
+    letter = _answer_letter(data.get("correct_answer"), options)
+    if letter is None:
+        return None
+    topic = data.get("topic")
+    return {
+        "topic": topic.strip() if isinstance(topic, str) else "",
+        "question": question.strip(),
+        "options": options,
+        "correct_answer": letter,
+    }
+
+
+def iter_questions(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Valid, normalised questions as their objects complete."""
+    for data in iter_objects(chunks):
+        question = validate_question(data)
+        PARSED.inc(result="valid" if question else "invalid")
+        if question:
+            yield question
+
+
+def parse_questions(text: str) -> List[Dict]:
+    return list(iter_questions([text]))
+
+
+def parse_string_list(text: str) -> List[str]:
+    """A JSON array of strings (e.g. topic names), tolerating fences or prose around it."""
+    start = text.find("[")
+    if start == -1:
+        return []
+    try:
+        values = json.loads(text[start:text.rfind("]") + 1])
+    except json.JSONDecodeError:
+        # Salvage the complete strings of a broken or truncated array
+        values = []
+        for literal in re.findall(r'"(?:[^"\\]|\\.)*"', text[start:]):
+            try:
+                values.append(json.loads(literal))
+            except json.JSONDecodeError:
+                continue
+    if not isinstance(values, list):
+        return []
+    return [value.strip() for value in values if isinstance(value, str) and value.strip()]
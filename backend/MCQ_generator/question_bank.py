@@ -0,0 +1,125 @@
+"""
+Persistent bank of generated multiple-choice questions.
+
+Every question Gemini produces is kept in a Common.store SQLite table, indexed
+by normalised chapter and topic, so a quiz can be drawn from the bank without a
+round trip to the LLM. sample() picks questions at random, spread across the
+chapter's topics, so students asking for the same chapter get varied quizzes.
+
+    from MCQ_generator.question_bank import bank
+
+    bank.add("Electricity", questions)      # duplicates are ignored
+    bank.sample("electricity ", 10)         # -> up to 10 random questions
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Dict, List, Optional
+
+from Common.store import connect
+
+
+def normalise_name(name: str) -> str:
+    """'Electricity.' and '  electricity ' index the same chapter."""
+    return " ".join(re.sub(r"[^\w\s'-]", " ", (name or "").casefold()).split())
+
+
+def fingerprint(chapter: str, question: str) -> str:
+    return hashlib.sha1(f"{normalise_name(chapter)}|{normalise_name(question)}".encode("utf-8")).hexdigest()
+
+
+class QuestionBank:
+    def __init__(self, path: Optional[str] = None):
+        self.connection, self.lock = connect(path)
+        with self.lock:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS mcq_questions ("
+                "id INTEGER PRIMARY KEY, chapter TEXT NOT NULL, topic TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL UNIQUE, question TEXT NOT NULL, options TEXT NOT NULL, "
+                "correct_answer TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS mcq_questions_chapter_topic ON mcq_questions (chapter, topic)"
+            )
+
+    def add(self, chapter: str, questions: List[Dict]) -> int:
+        """Store questions ({question, options, correct_answer, topic?}); returns how many were new."""
+        chapter_key = normalise_name(chapter)
+        now = time.time()
+        rows = [(chapter_key, normalise_name(q.get("topic", "")), fingerprint(chapter, q["question"]),
+                 q["question"], json.dumps(q["options"]), q["correct_answer"], now)
+                for q in questions]
+        with self.lock:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO mcq_questions "
+                "(chapter, topic, fingerprint, question, options, correct_answer, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return self.connection.total_changes - before
+
+    def count(self, chapter: str, topic: Optional[str] = None) -> int:
+        query, params = self._filter(chapter, topic)
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM mcq_questions WHERE {query}", params).fetchone()[0]
+
+    def questions(self, chapter: str, limit: Optional[int] = None, topic: Optional[str] = None) -> List[str]:
+        """Question texts of a chapter (or one of its topics), newest first."""
+        query, params = self._filter(chapter, topic)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT question FROM mcq_questions WHERE {query} ORDER BY id DESC LIMIT ?",
+                params + (-1 if limit is None else limit,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def topics(self, chapter: str) -> List[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT topic FROM mcq_questions WHERE chapter = ? AND topic != ''",
+                (normalise_name(chapter),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def sample(self, chapter: str, count: int, topic: Optional[str] = None) -> List[Dict]:
+        """Up to `count` random questions, taking turns between topics so no single topic dominates."""
+        query, params = self._filter(chapter, topic)
+        with self.lock:
+            index = self.connection.execute(f"SELECT id, topic FROM mcq_questions WHERE {query}", params).fetchall()
+
+        by_topic = {}
+        for question_id, question_topic in index:
+            by_topic.setdefault(question_topic, []).append(question_id)
+        pools = list(by_topic.values())
+        random.shuffle(pools)
+        for pool in pools:
+            random.shuffle(pool)
+        chosen = []
+        while pools and len(chosen) < count:
+            for pool in pools:
+                if pool and len(chosen) < count:
+                    chosen.append(pool.pop())
+            pools = [pool for pool in pools if pool]
+        if not chosen:
+            return []
+
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, topic, question, options, correct_answer FROM mcq_questions "
+                f"WHERE id IN ({','.join('?' * len(chosen))})", chosen
+            ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [{"topic": by_id[question_id][1], "question": by_id[question_id][2],
+                 "options": json.loads(by_id[question_id][3]), "correct_answer": by_id[question_id][4]}
+                for question_id in chosen if question_id in by_id]
+
+    @staticmethod
+    def _filter(chapter: str, topic: Optional[str]):
+        if topic is None:
+            return "chapter = ?", (normalise_name(chapter),)
+        return "chapter = ? AND topic = ?", (normalise_name(chapter), normalise_name(topic))
+
+
+bank = QuestionBank()
@@ -1,154 +1,321 @@
 import os
+import contextvars
+import functools
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pptx import Presentation
-import google.generativeai as genai
+from Common import llm, tracing, tts
+from Common.store import KeyValueStore
+from PPTtoVideo import storage
+from PPTtoVideo.render import slide_render_key, slide_to_image
 from dotenv import load_dotenv
-from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from pptx.util import Pt
 
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
 
 UPLOAD_FOLDER = 'uploads'
-AUDIO_FOLDER = 'static/audios'
-IMAGE_FOLDER = 'static/images'  # New folder for slide images
-
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(AUDIO_FOLDER, exist_ok=True)
-os.makedirs(IMAGE_FOLDER, exist_ok=True)
+
+# Bump whenever the narration prompt changes, so cached scripts are regenerated
+NARRATION_PROMPT_VERSION = 1
+NARRATION_MODEL = 'gemini-1.5-flash'
+
+# Generated narration keyed by slide text + prompt version
+narration_cache = KeyValueStore("slide_narrations",
+                                ttl=float(os.getenv('PPT_NARRATION_CACHE_TTL', str(30 * 24 * 3600))))
+CACHE_LOOKUPS = tracing.counter("backend_ppt_cache_lookups_total", "PPT pipeline cache lookups by cache and result")
+BATCH_FALLBACKS = tracing.counter("backend_ppt_narration_batch_fallbacks_total",
+                                  "Slides re-narrated individually after a batched request missed them")
+
+# Bounded parallelism per pipeline stage
+RENDER_WORKERS = int(os.getenv('PPT_RENDER_WORKERS', '4'))
+NARRATE_WORKERS = int(os.getenv('PPT_NARRATE_WORKERS', '8'))
+VOICE_WORKERS = int(os.getenv('PPT_VOICE_WORKERS', '8'))
+# Slides narrated per Gemini request; 1 keeps one request per slide
+NARRATION_BATCH_SIZE = int(os.getenv('PPT_NARRATION_BATCH_SIZE', '1'))
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini with API key from environment variable
 api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
+if not api_key and llm.requires_api_key():
     raise ValueError("GEMINI_API_KEY not found in environment variables")
-genai.configure(api_key=api_key)
-
-def slide_to_image(slide, image_path):
-    """Convert a slide to an image using PIL with improved text rendering"""
-    # Create a blank white image
-    width = 1920  # 16:9 aspect ratio
-    height = 1080
-    image = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(image)
-    
-    # Try to load a default system font, fallback to default
+llm.configure(api_key)
+
+class PipelineStats:
+    """Per-stage throughput and cache hit/miss counts for one deck."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.cache = {}
+
+    def record(self, stage, started, finished):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {"items": 0, "busy": 0.0, "first": started, "last": finished})
+            entry["items"] += 1
+            entry["busy"] += finished - started
+            entry["first"] = min(entry["first"], started)
+            entry["last"] = max(entry["last"], finished)
+
+    def cache_result(self, cache, hit):
+        with self.lock:
+            entry = self.cache.setdefault(cache, {"hits": 0, "misses": 0})
+            entry["hits" if hit else "misses"] += 1
+        CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+    def summary(self):
+        with self.lock:
+            stages = {}
+            for stage, entry in self.stages.items():
+                window = entry["last"] - entry["first"]
+                stages[stage] = {
+                    "items": entry["items"],
+                    "busy_seconds": round(entry["busy"], 3),
+                    "window_seconds": round(window, 3),
+                    "items_per_second": round(entry["items"] / window, 2) if window else None,
+                }
+            return {"stages": stages, "cache": {name: dict(entry) for name, entry in self.cache.items()}}
+
+
+def _timed_stage(stats, stage, func, *args):
+    started = time.perf_counter()
     try:
-        # For Windows
-        font_large = ImageFont.truetype("arial.ttf", 60)
-        font_normal = ImageFont.truetype("arial.ttf", 40)
-    except:
-        # Fallback to default
-        font_large = ImageFont.load_default()
-        font_normal = ImageFont.load_default()
-
-    # Collect and organize text content
-    title_text = ""
-    body_texts = []
-    
+        return func(*args)
+    finally:
+        finished = time.perf_counter()
+        stats.record(stage, started, finished)
+        tracing.record(f"ppt.{stage}", finished - started)
+
+
+def _submit(pool, func, *args):
+    # Run in a copy of the caller's context so spans still reach the request trace
+    return pool.submit(contextvars.copy_context().run, func, *args)
+
+
+def extract_slide_text(slide):
+    slide_text = ""
     for shape in slide.shapes:
-        if not hasattr(shape, "text"):
-            continue
-            
-        # Check if shape is likely a title (usually first text box or at the top)
-        if shape.top < height * 0.2 and not title_text:  # If in top 20% of slide
-            title_text = shape.text.strip()
-        else:
-            if shape.text.strip():
-                body_texts.append(shape.text.strip())
-    
-    # Draw title
-    if title_text:
-        # Center the title
-        title_bbox = draw.textbbox((0, 0), title_text, font=font_large)
-        title_width = title_bbox[2] - title_bbox[0]
-        title_x = (width - title_width) // 2
-        draw.text((title_x, 50), title_text, font=font_large, fill='black')
-    
-    # Draw body text
-    y_position = 200  # Start body text below title
-    for text in body_texts:
-        # Wrap text if too long
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            test_line = ' '.join(current_line)
-            bbox = draw.textbbox((0, 0), test_line, font=font_normal)
-            if bbox[2] - bbox[0] > width - 100:  # Leave 50px margin on each side
-                lines.append(' '.join(current_line[:-1]))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        # Draw each line
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=font_normal)
-            line_width = bbox[2] - bbox[0]
-            x_position = (width - line_width) // 2  # Center the line
-            draw.text((x_position, y_position), line, font=font_normal, fill='black')
-            y_position += 60  # Space between lines
-        
-        y_position += 40  # Extra space between paragraphs
-    
-    # Save the image
-    image.save(image_path, 'PNG')
-
-def generate_scripts(ppt_path):
+        if hasattr(shape, "text"):
+            slide_text += shape.text + " "
+    return slide_text
+
+
+def narration_key(slide_text):
+    return storage.content_hash(NARRATION_PROMPT_VERSION, NARRATION_MODEL, slide_text.strip())
+
+
+def speech_key(script):
+    return storage.content_hash(tts.get_engine().voice_id, script)
+
+
+def narrate_slide(model, slide_text):
+    """Generate the spoken description of one slide from its text."""
+    prompt = (
+        f"Based on the following slide content: {slide_text}\n"
+        "Describe this slide as if narrating to a blind user for 15 seconds. "
+        "Provide a short and concise description. Focus on the key points and main message."
+    )
+    response = model.generate_content(prompt, site="ppt_script")
+    return response.text.strip()
+
+
+def narrate_batch(slide_texts):
+    """
+    Narrate several slides with one request, asking for a JSON object that maps
+    slide numbers to scripts. Slides missing from (or unparseable in) the
+    response fall back to one narrate_slide call each.
+    """
+    model = llm.get_model(NARRATION_MODEL)
+    if len(slide_texts) == 1:
+        (slide_no, slide_text), = slide_texts.items()
+        return {slide_no: narrate_slide(model, slide_text)}
+
+    slides_block = "\n\n".join(f"Slide {slide_no}: {text}" for slide_no, text in slide_texts.items())
+    prompt = (
+        "You are narrating a slide deck to a blind user. For each slide below, describe it as if "
+        "narrating for 15 seconds. Provide a short and concise description. Focus on the key points "
+        "and main message.\n"
+        "Return only a JSON object mapping each slide number (as a string) to its narration, "
+        'e.g. {"1": "...", "2": "..."}.\n\n'
+        f"{slides_block}"
+    )
+    json_model = llm.get_model(NARRATION_MODEL, {"response_mime_type": "application/json"})
+    scripts = {}
+    try:
+        response = json_model.generate_content(prompt, site="ppt_script_batch")
+        parsed = json.loads(response.text)
+        for slide_no in slide_texts:
+            script = parsed.get(str(slide_no)) if isinstance(parsed, dict) else None
+            if isinstance(script, str) and script.strip():
+                scripts[slide_no] = script.strip()
+    except Exception as e:
+        logger.warning(f"Batched narration failed, falling back to per-slide requests: {e}")
+
+    missing = [slide_no for slide_no in slide_texts if slide_no not in scripts]
+    if missing:
+        BATCH_FALLBACKS.inc(len(missing))
+    for slide_no in missing:
+        scripts[slide_no] = narrate_slide(model, slide_texts[slide_no])
+    return scripts
+
+
+def iter_slides(ppt_path, filename=None, stats=None, batch_size=None, deck_hash=None):
+    """
+    Render, narrate and voice every slide of the deck concurrently, yielding
+    each slide's data as soon as its image and audio are both ready (so in
+    completion order, not slide order). Each stage has its own bounded pool:
+    rendering is CPU-bound, narration and TTS wait on the network.
+
+    Work is skipped wherever an earlier upload already produced it: a deck seen
+    before is served from its manifest, images are shared by identical slides
+    (see storage.py), scripts are cached by slide text and prompt version, and
+    audio is content-addressed by script text. Only changed slides pay for LLM
+    and TTS calls. Pass a PipelineStats to collect throughput and hit/miss counts.
+
+    batch_size (default PPT_NARRATION_BATCH_SIZE) > 1 narrates that many
+    uncached slides per Gemini request, see narrate_batch(). deck_hash skips
+    re-hashing the file when the caller already knows it.
+    """
+    filename = filename or os.path.basename(ppt_path)
+    batch_size = max(1, batch_size or NARRATION_BATCH_SIZE)
+    stats = stats or PipelineStats()
+    deck_hash = deck_hash or storage.file_sha256(ppt_path)
+
+    cached = storage.load_manifest(deck_hash)
+    stats.cache_result("deck", cached is not None)
+    if cached is not None:
+        logger.info(f"Reusing stored outputs for {filename} (deck {deck_hash[:12]})")
+        for slide in cached:
+            yield {**slide, 'filename': filename}
+        return
+
+    prs = Presentation(ppt_path)
+    slides = list(prs.slides)
+    started = time.perf_counter()
+
+    # Stage completions from all pools funnel through one queue
+    events = queue.Queue()
+
+    def notify(stage, slide_no):
+        return lambda future: events.put((stage, slide_no, future))
+
+    render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="ppt-render")
+    narrate_pool = ThreadPoolExecutor(max_workers=NARRATE_WORKERS, thread_name_prefix="ppt-narrate")
+    voice_pool = ThreadPoolExecutor(max_workers=VOICE_WORKERS, thread_name_prefix="ppt-voice")
+
+    image_paths = {}
+    audio_paths = {}
+    narration_keys = {}
+    scripts = {}
+    rendered = set()
+    voiced = set()
+    completed = []
+    # Outputs of this deck, kept out of storage.evict() until the deck is done
+    held = []
+
+    def hold(path):
+        storage.pin(path)
+        held.append(path)
+
+    def start_voice(slide_no, script):
+        audio_paths[slide_no] = storage.audio_path(speech_key(script), tts.get_engine().extension)
+        hold(audio_paths[slide_no])
+        hit = storage.reuse(audio_paths[slide_no])
+        stats.cache_result("audio", hit)
+        if hit:
+            voiced.add(slide_no)
+            return
+        future = _submit(voice_pool, _timed_stage, stats, "tts", storage.write_atomic,
+                         audio_paths[slide_no], functools.partial(generate_voiceover, script))
+        future.add_done_callback(notify("tts", slide_no))
+
+    def finish(slide_no):
+        slide_data = {
+            'filename': filename,
+            'slide_no': slide_no,
+            'image_url': storage.url_for_path(image_paths[slide_no]),
+            'script': scripts[slide_no],
+            'audio_url': storage.url_for_path(audio_paths[slide_no])
+        }
+        completed.append(slide_data)
+        return slide_data
+
+    try:
+        to_narrate = {}
+        for slide_no, slide in enumerate(slides, 1):
+            image_paths[slide_no] = storage.image_path(slide_render_key(slide))
+            hold(image_paths[slide_no])
+            hit = storage.reuse(image_paths[slide_no])
+            stats.cache_result("image", hit)
+            if hit:
+                rendered.add(slide_no)
+            else:
+                future = _submit(render_pool, _timed_stage, stats, "render", storage.write_atomic,
+                                 image_paths[slide_no], functools.partial(slide_to_image, slide))
+                future.add_done_callback(notify("render", slide_no))
+
+            slide_text = extract_slide_text(slide)
+            narration_keys[slide_no] = narration_key(slide_text)
+            cached_script = narration_cache.get(narration_keys[slide_no])
+            stats.cache_result("narration", cached_script is not None)
+            if cached_script is not None:
+                scripts[slide_no] = cached_script
+                start_voice(slide_no, cached_script)
+            else:
+                to_narrate[slide_no] = slide_text
+
+        pending = list(to_narrate.items())
+        for start in range(0, len(pending), batch_size):
+            future = _submit(narrate_pool, _timed_stage, stats, "narrate",
+                             narrate_batch, dict(pending[start:start + batch_size]))
+            future.add_done_callback(notify("narrate", None))
+
+        # Slides whose outputs were all cached are ready straight away
+        for slide_no in sorted(rendered & voiced):
+            yield finish(slide_no)
+
+        while len(completed) < len(slides):
+            stage, slide_no, future = events.get()
+            result = future.result()  # re-raises the stage's exception
+            if stage == "narrate":
+                # One narration task covers a batch of slides
+                touched = sorted(result)
+                for narrated_no, script in result.items():
+                    scripts[narrated_no] = script
+                    narration_cache.set(narration_keys[narrated_no], script)
+                    start_voice(narrated_no, script)
+            else:
+                (rendered if stage == "render" else voiced).add(slide_no)
+                touched = [slide_no]
+
+            for done_no in touched:
+                if done_no in rendered and done_no in voiced:
+                    yield finish(done_no)
+
+        storage.save_manifest(deck_hash, sorted(completed, key=lambda slide: slide['slide_no']))
+        freed = storage.evict()
+        logger.info(f"Processed {len(slides)} slides of {filename} (deck {deck_hash[:12]}) in "
+                    f"{time.perf_counter() - started:.2f}s, {stats.summary()}"
+                    + (f", evicted {freed} bytes" if freed else ""))
+    finally:
+        # Also runs when the consumer stops early; drop work that has not started
+        for pool in (render_pool, narrate_pool, voice_pool):
+            pool.shutdown(wait=False, cancel_futures=True)
+        storage.unpin(*held)
+
+
+def generate_scripts(ppt_path, filename=None, batch_size=None, deck_hash=None):
     try:
-        prs = Presentation(ppt_path)
-        slides_data = []
-        
-        # Initialize Gemini model
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        for index, slide in enumerate(prs.slides):
-            # Save slide as image
-            image_filename = f"slide_{index + 1}.png"
-            image_path = os.path.join(IMAGE_FOLDER, image_filename)
-            
-            # Convert slide to image
-            slide_to_image(slide, image_path)
-            
-            # Extract slide content
-            slide_text = ""
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    slide_text += shape.text + " "
-            
-            # Generate scene description using slide text and Gemini
-            prompt = (
-                f"Based on the following slide content: {slide_text}\n"
-                "Describe this slide as if narrating to a blind user for 15 seconds. "
-                "Provide a short and concise description. Focus on the key points and main message."
-            )
-            
-            response = model.generate_content(prompt)
-            scene_description = response.text.strip()
-            
-            # Generate voiceover
-            audio_filename = f"slide_{index + 1}.mp3"
-            audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
-            generate_voiceover(scene_description, audio_path)
-            
-            slides_data.append({
-                'filename': os.path.basename(ppt_path),
-                'slide_no': index + 1,
-                'image_url': f"/static/images/{image_filename}",
-                'script': scene_description,
-                'audio_url': f"/static/audios/{audio_filename}"
-            })
-            
-        return slides_data
+        slides = iter_slides(ppt_path, filename, batch_size=batch_size, deck_hash=deck_hash)
+        return sorted(slides, key=lambda slide: slide['slide_no'])
     except Exception as e:
         raise Exception(f"Error processing PPT: {str(e)}")
 
 def generate_voiceover(text, audio_path):
-    # Implement text-to-speech conversion using a suitable library or API
-    # Example using gTTS:
-    from gtts import gTTS
-    tts = gTTS(text)
-    tts.save(audio_path)
+    """Synthesise the narration with the deployment's TTS engine (TTS_ENGINE)."""
+    tts.synthesize(text, audio_path)
@@ -1,10 +1,10 @@
-from flask import Flask, request, jsonify
-from PPT_Script import generate_scripts
-from flask import Flask, request, jsonify
+# Run from backend/ with: python -m PPTtoVideo.app
+from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
-from PPT_Script import generate_scripts
+from werkzeug.utils import secure_filename
+from PPTtoVideo.video import PPTProcessor
 import os
-import google.generativeai as genai  # Add Generative AI import
+import logging
 
 app = Flask(__name__)
 
@@ -0,0 +1,224 @@
+"""
+Slide rasteriser for the PPT pipeline.
+
+Fonts are loaded once per size for the whole process, and word wrapping is
+linear in paragraph length: every distinct word is measured once (cached
+advance widths) and lines are built by summing widths instead of re-measuring
+the growing line after each word. Overlong words are split with a binary search.
+
+Pictures and solid-filled shapes are drawn at their slide positions beneath the
+text when RENDER_SHAPES is on (default).
+"""
+import functools
+import os
+from io import BytesIO
+from typing import List
+
+from PIL import Image, ImageDraw, ImageFont
+from pptx.enum.dml import MSO_FILL
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from PPTtoVideo import storage
+
+# Bump whenever rendered output changes, so cached images are not reused
+RENDER_VERSION = 2
+
+WIDTH = 1920  # 16:9 aspect ratio
+HEIGHT = 1080
+MARGIN = 50
+TITLE_FONT_SIZE = 60
+BODY_FONT_SIZE = 40
+TITLE_Y = 50
+BODY_START_Y = 200
+LINE_HEIGHT = 60
+PARAGRAPH_GAP = 40
+
+RENDER_SHAPES = os.getenv('RENDER_SHAPES', '1').lower() in ('1', 'true', 'yes')
+
+# Tried in order; arial for Windows hosts, DejaVu / Liberation on Linux
+FONT_CANDIDATES = ("arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf")
+
+# Default python-pptx slide size (10in x 7.5in) in EMU
+DEFAULT_SLIDE_SIZE = (9144000, 6858000)
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size):
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=65536)
+def text_width(font, text):
+    return font.getlength(text)
+
+
+def _split_long_word(font, word, max_width):
+    """Break a word wider than max_width into the longest fitting prefixes."""
+    pieces = []
+    while word and text_width(font, word) > max_width:
+        low, high = 1, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if font.getlength(word[:mid]) <= max_width:
+                low = mid
+            else:
+                high = mid - 1
+        pieces.append(word[:low])
+        word = word[low:]
+    if word:
+        pieces.append(word)
+    return pieces
+
+
+def wrap_text(text, font, max_width) -> List[str]:
+    space = text_width(font, ' ')
+    lines = []
+    current = []
+    current_width = 0.0
+    for word in text.split():
+        word_width = text_width(font, word)
+        if word_width > max_width:
+            pieces = _split_long_word(font, word, max_width)
+            if current:
+                lines.append(' '.join(current))
+            lines.extend(pieces[:-1])
+            current = [pieces[-1]]
+            current_width = text_width(font, pieces[-1])
+            continue
+        added = word_width + (space if current else 0)
+        if current and current_width + added > max_width:
+            lines.append(' '.join(current))
+            current = [word]
+            current_width = word_width
+        else:
+            current.append(word)
+            current_width += added
+    if current:
+        lines.append(' '.join(current))
+    return lines
+
+
+def _slide_size(slide):
+    try:
+        presentation = slide.part.package.presentation_part.presentation
+        return presentation.slide_width, presentation.slide_height
+    except AttributeError:
+        return DEFAULT_SLIDE_SIZE
+
+
+def _solid_fill(shape):
+    """RGB hex of a shape's explicit solid fill, or None."""
+    try:
+        if shape.fill.type == MSO_FILL.SOLID:
+            return str(shape.fill.fore_color.rgb)
+    except (AttributeError, TypeError, ValueError, NotImplementedError):
+        pass
+    return None
+
+
+def _shape_type(shape):
+    """The shape's MSO_SHAPE_TYPE, or None for shapes python-pptx cannot classify (e.g. no geometry)."""
+    try:
+        return shape.shape_type
+    except NotImplementedError:
+        return None
+
+
+def _box(shape, scale_x, scale_y):
+    left = int((shape.left or 0) * scale_x)
+    top = int((shape.top or 0) * scale_y)
+    return left, top, left + int((shape.width or 0) * scale_x), top + int((shape.height or 0) * scale_y)
+
+
+def slide_render_key(slide):
+    """Hash of everything slide_to_image draws, used to share images between decks."""
+    parts = [RENDER_VERSION, RENDER_SHAPES, *_slide_size(slide)]
+    for shape in slide.shapes:
+        if hasattr(shape, "text"):
+            parts.extend((shape.top, shape.text))
+        if not RENDER_SHAPES:
+            continue
+        shape_type = _shape_type(shape)
+        if shape_type is None:
+            continue
+        if shape_type == MSO_SHAPE_TYPE.PICTURE:
+            try:
+                sha1 = shape.image.sha1
+            except ValueError:
+                continue  # linked picture, nothing embedded to draw
+            parts.extend(("picture", shape.left, shape.top, shape.width, shape.height, sha1))
+        else:
+            fill = _solid_fill(shape)
+            if fill:
+                parts.extend(("fill", shape.left, shape.top, shape.width, shape.height, fill))
+    return storage.content_hash(*parts)
+
+
+def _draw_shapes(image, draw, slide, scale_x, scale_y):
+    for shape in slide.shapes:
+        shape_type = _shape_type(shape)
+        if shape_type is None:
+            continue
+        if shape_type == MSO_SHAPE_TYPE.PICTURE:
+            left, top, right, bottom = _box(shape, scale_x, scale_y)
+            if right <= left or bottom <= top:
+                continue
+            try:
+                picture = Image.open(BytesIO(shape.image.blob)).convert('RGBA')
+            except (OSError, ValueError):
+                continue  # e.g. WMF/EMF pictures Pillow cannot decode
+            picture = picture.resize((right - left, bottom - top))
+            image.paste(picture, (left, top), picture)
+        else:
+            fill = _solid_fill(shape)
+            if fill:
+                draw.rectangle(_box(shape, scale_x, scale_y), fill=f"#{fill}")
+
+
+def slide_to_image(slide, image_path):
+    """Convert a slide to a PNG: title centred at the top, wrapped and centred body text below"""
+    image = Image.new('RGB', (WIDTH, HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    font_large = load_font(TITLE_FONT_SIZE)
+    font_normal = load_font(BODY_FONT_SIZE)
+
+    slide_width, slide_height = _slide_size(slide)
+    if RENDER_SHAPES:
+        _draw_shapes(image, draw, slide, WIDTH / slide_width, HEIGHT / slide_height)
+
+    # Collect and organize text content
+    title_text = ""
+    body_texts = []
+    for shape in slide.shapes:
+        if not hasattr(shape, "text"):
+            continue
+        text = shape.text.strip()
+        # The first text shape in the top 20% of the slide is taken as the title
+        if not title_text and shape.top is not None and shape.top < slide_height * 0.2:
+            title_text = text
+        elif text:
+            body_texts.append(text)
+
+    if title_text:
+        title_x = (WIDTH - int(text_width(font_large, title_text))) // 2
+        draw.text((title_x, TITLE_Y), title_text, font=font_large, fill='black')
+
+    y_position = BODY_START_Y
+    max_width = WIDTH - 2 * MARGIN
+    for text in body_texts:
+        for line in wrap_text(text, font_normal, max_width):
+            x_position = (WIDTH - int(text_width(font_normal, line))) // 2
+            draw.text((x_position, y_position), line, font=font_normal, fill='black')
+            y_position += LINE_HEIGHT
+        y_position += PARAGRAPH_GAP
+
+    image.save(image_path, 'PNG')
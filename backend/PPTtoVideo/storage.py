@@ -0,0 +1,242 @@
+"""
+Content-addressed storage for generated slide images and audio.
+
+static/images/<render hash>.png         slide images, shared by every deck that
+                                        contains a slide with identical content
+static/audios/<speech hash>.<ext>       narration audio, keyed by voice + script text
+static/decks/<deck hash>/manifest.json  slide list of a fully processed deck
+static/segments/<segment hash>.mp4      per-slide video segments, keyed by image + audio
+static/videos/<video hash>.mp4          rendered deck videos, see video.py
+
+Writes go through a temporary file and os.replace, so concurrent uploads never
+observe half-written files. Reusing a file refreshes its mtime, which makes
+mtime an LRU clock for evict(). evict() never deletes a file used in the last
+PPT_STORAGE_PROTECT_MINUTES, one listed in a manifest used in that time, or
+one pinned by work still in flight in this process (pin() / unpin()).
+"""
+import collections
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Set
+
+STATIC_FOLDER = 'static'
+IMAGE_FOLDER = os.path.join(STATIC_FOLDER, 'images')
+AUDIO_FOLDER = os.path.join(STATIC_FOLDER, 'audios')
+DECK_FOLDER = os.path.join(STATIC_FOLDER, 'decks')
+SEGMENT_FOLDER = os.path.join(STATIC_FOLDER, 'segments')
+VIDEO_FOLDER = os.path.join(STATIC_FOLDER, 'videos')
+
+# Size budget across all managed folders before least recently used files are evicted
+MAX_STORAGE_BYTES = int(os.getenv('PPT_STORAGE_MAX_MB', '2048')) * 1024 * 1024
+# Files used this recently (and files their manifests list) are never evicted
+PROTECT_SECONDS = float(os.getenv('PPT_STORAGE_PROTECT_MINUTES', '15')) * 60
+
+MANAGED_FOLDERS = (IMAGE_FOLDER, AUDIO_FOLDER, DECK_FOLDER, SEGMENT_FOLDER, VIDEO_FOLDER)
+for _folder in MANAGED_FOLDERS:
+    os.makedirs(_folder, exist_ok=True)
+
+_evict_lock = threading.Lock()
+# normalised path -> number of in-flight users
+_pinned = collections.Counter()
+_pinned_lock = threading.Lock()
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(*parts) -> str:
+    """Stable hash over strings / bytes, with separators so ("ab", "c") != ("a", "bc")."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def url_for_path(path: str) -> str:
+    return '/' + path.replace(os.sep, '/')
+
+
+def path_for_url(url: str) -> str:
+    return url.lstrip('/').replace('/', os.sep)
+
+
+def image_path(render_hash: str) -> str:
+    return os.path.join(IMAGE_FOLDER, f"{render_hash}.png")
+
+
+def segment_path(segment_hash: str) -> str:
+    return os.path.join(SEGMENT_FOLDER, f"{segment_hash}.mp4")
+
+
+def video_path(video_hash: str) -> str:
+    return os.path.join(VIDEO_FOLDER, f"{video_hash}.mp4")
+
+
+def deck_folder(deck_hash: str) -> str:
+    folder = os.path.join(DECK_FOLDER, deck_hash)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def audio_path(speech_hash: str, extension: str = 'mp3') -> str:
+    return os.path.join(AUDIO_FOLDER, f"{speech_hash}.{extension}")
+
+
+def touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def reuse(path: str) -> bool:
+    """True if `path` already exists; also marks it as recently used."""
+    if os.path.exists(path):
+        touch(path)
+        return True
+    return False
+
+
+def pin(*paths: str) -> None:
+    """Keep paths out of evict() until a matching unpin(), e.g. while a deck or video job uses them."""
+    with _pinned_lock:
+        _pinned.update(os.path.normpath(path) for path in paths)
+
+
+def unpin(*paths: str) -> None:
+    with _pinned_lock:
+        for path in map(os.path.normpath, paths):
+            _pinned[path] -= 1
+            if _pinned[path] <= 0:
+                del _pinned[path]
+
+
+@contextmanager
+def pinned(paths: Iterable[str]):
+    paths = list(paths)
+    pin(*paths)
+    try:
+        yield
+    finally:
+        unpin(*paths)
+
+
+def write_atomic(path: str, producer):
+    """Call producer(tmp_path) to create the file, then move it into place. Returns the producer's result."""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    suffix = os.path.splitext(path)[1]
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp-', suffix=suffix)
+    os.close(fd)
+    try:
+        result = producer(tmp_path)
+        os.replace(tmp_path, path)
+        return result
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _manifest_path(deck_hash: str) -> str:
+    return os.path.join(DECK_FOLDER, deck_hash, 'manifest.json')
+
+
+def load_manifest(deck_hash: str) -> Optional[List[dict]]:
+    """Slides of a previously processed deck, or None if any output has since been evicted."""
+    path = _manifest_path(deck_hash)
+    try:
+        with open(path) as f:
+            slides = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for slide in slides:
+        for key in ('image_url', 'audio_url'):
+            if not reuse(path_for_url(slide[key])):
+                return None
+    touch(path)
+    return slides
+
+
+def save_manifest(deck_hash: str, slides: List[dict]) -> None:
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(slides, f, indent=4)
+    write_atomic(_manifest_path(deck_hash), write)
+
+
+def _protected_paths(cutoff: float) -> Set[str]:
+    """Pinned paths, plus the images and audio of every manifest used since cutoff."""
+    with _pinned_lock:
+        protected = set(_pinned)
+    for name in os.listdir(DECK_FOLDER):
+        path = _manifest_path(name)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                continue
+            with open(path) as f:
+                slides = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for slide in slides:
+            for key in ('image_url', 'audio_url'):
+                if slide.get(key):
+                    protected.add(os.path.normpath(path_for_url(slide[key])))
+    return protected
+
+
+def evict(max_bytes: int = MAX_STORAGE_BYTES) -> int:
+    """
+    Delete least recently used files until the managed folders fit in
+    max_bytes, sparing protected files (see above). Returns bytes freed.
+    """
+    with _evict_lock:
+        entries = []
+        total = 0
+        for folder in MANAGED_FOLDERS:
+            for root, _, files in os.walk(folder):
+                for name in files:
+                    if name.startswith('.tmp-'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+        if total <= max_bytes:
+            return 0
+
+        cutoff = time.time() - PROTECT_SECONDS
+        protected = _protected_paths(cutoff)
+        freed = 0
+        for mtime, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            if mtime >= cutoff or os.path.normpath(path) in protected:
+                continue
+            try:
+                os.remove(path)
+                freed += size
+            except OSError:
+                continue
+
+        # Drop deck folders left empty
+        for name in os.listdir(DECK_FOLDER):
+            folder = os.path.join(DECK_FOLDER, name)
+            if os.path.isdir(folder) and not os.listdir(folder):
+                shutil.rmtree(folder, ignore_errors=True)
+        return freed
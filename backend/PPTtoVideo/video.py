@@ -0,0 +1,346 @@
+"""
+Server-side PPT-to-MP4 rendering.
+
+A deck is taken through the slide pipeline (iter_slides, so images, scripts and
+audio are reused from storage where possible), optionally with edited scripts
+replacing the generated ones. Each slide becomes its own MP4 segment (image
+held for exactly the length of its audio), and the segments are joined with a
+stream copy.
+
+Segments are content-addressed by image + audio in static/segments, so after
+editing one slide's script only that slide is voiced and encoded again; the
+rest of the video is reused and the final join takes a fraction of a second.
+
+Finished videos are content-addressed by deck hash + edited scripts + voice in
+static/videos (see storage.py), so asking for the same video again is free.
+Renders run on a small background pool; submit() returns a VideoJob whose
+status and progress the API polls. Jobs live in process memory; a finished
+job's video is pinned in storage while the job is kept, and a job whose video
+was evicted anyway (e.g. by another worker process) reports status 'expired'.
+
+PPT_VIDEO_WORKERS   concurrent renders (default 2)
+PPT_VIDEO_SEGMENT_WORKERS  segments encoded in parallel per render (default 2)
+PPT_VIDEO_FPS       output frame rate; slides are stills so this stays low (default 5)
+PPT_VIDEO_JOB_TTL   seconds a finished job's status is kept (default 3600)
+"""
+import functools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pptx import Presentation
+
+from Common import tracing, tts
+from PPTtoVideo import storage
+from PPTtoVideo import PPT_Script as ppt_script
+
+# Bump whenever the encoding settings change, so stored videos are re-rendered
+VIDEO_VERSION = 2
+VIDEO_WORKERS = int(os.getenv('PPT_VIDEO_WORKERS', '2'))
+SEGMENT_WORKERS = int(os.getenv('PPT_VIDEO_SEGMENT_WORKERS', '2'))
+VIDEO_FPS = int(os.getenv('PPT_VIDEO_FPS', '5'))
+VIDEO_JOB_TTL = float(os.getenv('PPT_VIDEO_JOB_TTL', '3600'))
+
+# Share of overall progress covered by each stage: (start, end)
+STAGE_PROGRESS = {
+    'slides': (0.0, 0.6),
+    'voice': (0.6, 0.7),
+    'segments': (0.7, 0.97),
+    'mux': (0.97, 1.0),
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _tool(name):
+    path = shutil.which(name)
+    if not path:
+        raise RuntimeError(f"{name} is required for video rendering but was not found on PATH")
+    return path
+
+
+def normalise_scripts(scripts):
+    """Edited scripts per slide; blank entries mean 'keep the generated script'."""
+    if scripts is None:
+        return None
+    normalised = [script.strip() if isinstance(script, str) and script.strip() else None for script in scripts]
+    return normalised if any(normalised) else None
+
+
+def video_key(deck_hash, scripts=None):
+    return storage.content_hash(VIDEO_VERSION, VIDEO_FPS, deck_hash, tts.get_engine().voice_id,
+                                json.dumps(normalise_scripts(scripts)))
+
+
+def audio_duration(path):
+    output = subprocess.run(
+        [_tool('ffprobe'), '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip())
+
+
+def _concat_line(path):
+    # Concat demuxer syntax: single-quoted, with embedded quotes escaped
+    return "file '" + os.path.abspath(path).replace("'", "'\\''") + "'\n"
+
+
+def _ffmpeg(*args):
+    result = subprocess.run([_tool('ffmpeg'), '-hide_banner', '-loglevel', 'error', '-y', *args],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+
+
+def segment_key(image_path, audio_path):
+    # Both inputs are content-addressed, so their names identify their content
+    return storage.content_hash(VIDEO_VERSION, VIDEO_FPS, os.path.basename(image_path), os.path.basename(audio_path))
+
+
+def render_segment(image_path, audio_path, output_path):
+    """One slide: the image held for exactly the duration of its audio."""
+    duration = audio_duration(audio_path)
+    with tracing.span('ppt.video_segment'):
+        # Fixed codec parameters on every segment, so they can be joined without re-encoding
+        _ffmpeg('-loop', '1', '-framerate', str(VIDEO_FPS), '-i', image_path, '-i', audio_path,
+                '-t', f"{duration:.3f}", '-map', '0:v', '-map', '1:a',
+                '-c:v', 'libx264', '-tune', 'stillimage', '-pix_fmt', 'yuv420p', '-r', str(VIDEO_FPS),
+                '-c:a', 'aac', '-b:a', '128k', '-ar', '44100', '-ac', '1',
+                '-f', 'mp4', output_path)
+
+
+def render_video(slides, output_path, on_progress=None):
+    """
+    Join [(image_path, audio_path), ...] into an MP4 at output_path, encoding
+    only the slides without a stored segment. on_progress(stage, fraction)
+    reports 'segments' then 'mux'. Returns the number of reused segments.
+    """
+    on_progress = on_progress or (lambda stage, fraction: None)
+    segments = [storage.segment_path(segment_key(image, audio)) for image, audio in slides]
+    # Joined at the end, so none of them may be evicted while the others are encoded
+    with storage.pinned(segments):
+        missing = {}
+        for segment, inputs in zip(segments, slides):
+            if segment not in missing and not storage.reuse(segment):
+                missing[segment] = inputs
+
+        on_progress('segments', 0.0)
+        with ThreadPoolExecutor(max_workers=SEGMENT_WORKERS, thread_name_prefix='ppt-video-segment') as pool:
+            futures = [pool.submit(storage.write_atomic, segment, functools.partial(render_segment, image, audio))
+                       for segment, (image, audio) in missing.items()]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                on_progress('segments', done / len(futures))
+
+        on_progress('mux', 0.0)
+        with tempfile.TemporaryDirectory(prefix='ppt-video-') as tmp:
+            list_path = os.path.join(tmp, 'segments.txt')
+            with open(list_path, 'w') as f:
+                f.writelines(_concat_line(segment) for segment in segments)
+            with tracing.span('ppt.video_concat'):
+                _ffmpeg('-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy',
+                        '-movflags', '+faststart', '-f', 'mp4', output_path)
+        on_progress('mux', 1.0)
+    return len(segments) - len(missing)
+
+
+def _voice(script):
+    path = storage.audio_path(ppt_script.speech_key(script), tts.get_engine().extension)
+    if not storage.reuse(path):
+        storage.write_atomic(path, functools.partial(ppt_script.generate_voiceover, script))
+    return path
+
+
+def render_deck(ppt_path, scripts=None, filename=None, deck_hash=None, on_progress=None, summary=None):
+    """
+    Produce (or reuse) the MP4 for a deck and return its path. scripts, if
+    given, has one entry per slide; non-blank entries replace that slide's
+    generated narration. on_progress(stage, fraction) reports pipeline,
+    voice-over and encoding progress. A summary dict, if passed, receives the
+    edited slide numbers and how many segments were reused.
+    """
+    on_progress = on_progress or (lambda stage, fraction: None)
+    scripts = normalise_scripts(scripts)
+    deck_hash = deck_hash or storage.file_sha256(ppt_path)
+    path = storage.video_path(video_key(deck_hash, scripts))
+    if storage.reuse(path):
+        return path
+
+    total = len(Presentation(ppt_path).slides)
+    if not total:
+        raise ValueError("The presentation has no slides")
+    if scripts is not None and len(scripts) != total:
+        raise ValueError(f"Expected {total} scripts, one per slide, got {len(scripts)}")
+
+    slides = []
+    on_progress('slides', 0.0)
+    for slide in ppt_script.iter_slides(ppt_path, filename, deck_hash=deck_hash):
+        slides.append(slide)
+        on_progress('slides', len(slides) / total)
+    slides.sort(key=lambda slide: slide['slide_no'])
+
+    audio_paths = [storage.path_for_url(slide['audio_url']) for slide in slides]
+    edited = []
+    if scripts is not None:
+        # Only slides whose script differs from the stored one need new audio
+        edited = [index for index, script in enumerate(scripts)
+                  if script is not None and script != slides[index]['script']]
+        on_progress('voice', 0.0)
+        with ThreadPoolExecutor(max_workers=ppt_script.VOICE_WORKERS, thread_name_prefix='ppt-video-voice') as pool:
+            for done, (index, audio) in enumerate(
+                    zip(edited, pool.map(_voice, [scripts[index] for index in edited])), 1):
+                audio_paths[index] = audio
+                on_progress('voice', done / len(edited))
+
+    pairs = [(storage.path_for_url(slide['image_url']), audio) for slide, audio in zip(slides, audio_paths)]
+    with storage.pinned([file for pair in pairs for file in pair]):
+        reused = storage.write_atomic(path, functools.partial(render_video, pairs, on_progress=on_progress))
+    logger.info(f"Video for {filename or os.path.basename(ppt_path)}: {len(edited)} edited slides, "
+                f"reused {reused} of {len(pairs)} segments")
+    if summary is not None:
+        summary.update(edited_slides=[index + 1 for index in edited], segments=len(pairs), reused_segments=reused)
+    storage.evict()
+    return path
+
+
+class PPTProcessor:
+    """Synchronous renderer, as used by the standalone PPTtoVideo/app.py."""
+
+    def process_ppt(self, ppt_path, output_path, script_list=None):
+        shutil.copyfile(render_deck(ppt_path, script_list), output_path)
+        return output_path
+
+
+class VideoJob:
+    def __init__(self, job_id, filename):
+        self.job_id = job_id
+        self.filename = filename
+        self.status = 'queued'
+        self.stage = None
+        self.progress = 0.0
+        self.video_path = None
+        self.error = None
+        self.summary = {}
+        self.updated_at = time.time()
+        self.lock = threading.Lock()
+
+    def update(self, stage, fraction):
+        start, end = STAGE_PROGRESS[stage]
+        with self.lock:
+            self.status = 'running'
+            self.stage = stage
+            self.progress = max(self.progress, start + (end - start) * fraction)
+            self.updated_at = time.time()
+
+    def finish(self, video_path=None, error=None):
+        with self.lock:
+            self.status = 'error' if error else 'done'
+            self.error = error
+            self.video_path = video_path
+            if video_path:
+                self.progress = 1.0
+                # Kept out of storage.evict() until the job is pruned
+                storage.pin(video_path)
+            self.updated_at = time.time()
+
+    def release(self):
+        with self.lock:
+            if self.video_path:
+                storage.unpin(self.video_path)
+
+    def check_expired(self):
+        """Mark a finished job expired if its video has been removed from storage (e.g. by another worker)."""
+        with self.lock:
+            if self.status != 'done' or os.path.exists(self.video_path):
+                return
+            storage.unpin(self.video_path)
+            self.status = 'expired'
+            self.video_path = None
+            self.progress = 0.0
+            self.error = 'The video has expired from storage; submit the deck again'
+            self.updated_at = time.time()
+
+    def to_dict(self):
+        with self.lock:
+            data = {
+                'job_id': self.job_id,
+                'filename': self.filename,
+                'status': self.status,
+                'stage': self.stage,
+                'progress': round(self.progress * 100, 1),
+            }
+            if self.video_path:
+                name = os.path.basename(self.video_path)
+                data['video_url'] = storage.url_for_path(self.video_path)
+                data['download_url'] = f"/download/{name}"
+            if self.error:
+                data['error'] = self.error
+            data.update(self.summary)
+            return data
+
+
+_executor = ThreadPoolExecutor(max_workers=VIDEO_WORKERS, thread_name_prefix='ppt-video')
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs():
+    cutoff = time.time() - VIDEO_JOB_TTL
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if job.status in ('done', 'error', 'expired') and job.updated_at < cutoff]:
+        _jobs.pop(job_id).release()
+
+
+def _run(job, ppt_path, deck_hash, scripts):
+    try:
+        job.finish(video_path=render_deck(ppt_path, scripts, job.filename, deck_hash, job.update, job.summary))
+        logger.info(f"Rendered video for {job.filename} ({job.job_id[:12]})")
+    except Exception as e:
+        logger.error(f"Video rendering failed for {job.filename}: {e}", exc_info=True)
+        job.finish(error=str(e))
+    finally:
+        if os.path.exists(ppt_path):
+            os.remove(ppt_path)
+
+
+def submit(ppt_path, filename=None, scripts=None, deck_hash=None):
+    """
+    Start rendering in the background and return its VideoJob. The job id is
+    the video's cache key, so identical requests share one job, and a video
+    rendered earlier completes immediately. Takes ownership of ppt_path.
+    """
+    filename = filename or os.path.basename(ppt_path)
+    scripts = normalise_scripts(scripts)
+    deck_hash = deck_hash or storage.file_sha256(ppt_path)
+    job_id = video_key(deck_hash, scripts)
+
+    with _jobs_lock:
+        _prune_jobs()
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.check_expired()
+        if job is None or job.status in ('error', 'expired'):
+            job = _jobs[job_id] = VideoJob(job_id, filename)
+            video_path = storage.video_path(job_id)
+            if storage.reuse(video_path):
+                job.finish(video_path=video_path)
+            else:
+                _executor.submit(_run, job, ppt_path, deck_hash, scripts)
+                return job
+    if os.path.exists(ppt_path):
+        os.remove(ppt_path)
+    return job
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is not None:
+        job.check_expired()
+    return job
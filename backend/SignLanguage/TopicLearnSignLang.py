@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
+from Common import llm
 from SignLanguage.sentenceToSignLanguage import fail_safe_translate, model
 import sign_language_translator as slt
 
@@ -8,9 +8,9 @@ import sign_language_translator as slt
 load_dotenv()
 GENAI_API_KEY = os.getenv("GENAI_API_KEY")
 
-if not GENAI_API_KEY:
+if not GENAI_API_KEY and llm.requires_api_key():
     raise ValueError("GENAI_API_KEY is not set in the .env file")
-genai.configure(api_key=GENAI_API_KEY)
+llm.configure(GENAI_API_KEY)
 
 # Configure Gemini Model
 generation_config_text = {
@@ -20,10 +20,7 @@ generation_config_text = {
     "max_output_tokens": 500,
 }
 
-text_model = genai.GenerativeModel(
-    "gemini-1.5-flash",
-    generation_config=generation_config_text
-)
+text_model = llm.get_model("gemini-1.5-flash", generation_config_text)
 
 def generate_psl_text(topic):
     """
@@ -80,7 +77,7 @@ def generate_psl_text(topic):
     # )
 
     # Generate text using Gemini model
-    response = text_model.generate_content([prompt])
+    response = text_model.generate_content([prompt], site="psl_text")
     generated_text = "".join(chunk.text for chunk in response)
     return generated_text.strip()
 
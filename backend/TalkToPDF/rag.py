@@ -4,7 +4,7 @@ from werkzeug.utils import secure_filename
 import magic
 from datetime import datetime
 from dotenv import load_dotenv
-import google.generativeai as genai
+from Common import llm, tracing
 import numpy as np
 from typing import List, Optional
 from PyPDF2 import PdfReader
@@ -32,30 +32,37 @@ class RAGSystem:
                  model_name: str = "gemini-pro"):
         """Initialize RAG system with PDF and Gemini"""
         if api_key:
-            genai.configure(api_key=api_key)
+            llm.configure(api_key)
         
-        self.model = genai.GenerativeModel(model_name)
-        self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        self.model = llm.get_model(model_name)
+        with tracing.span("rag.load_embeddings"):
+            self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
         self.vector_store = None
         self._process_pdf(pdf_path)
 
     def _process_pdf(self, pdf_path: str) -> None:
-        pdf_reader = PdfReader(pdf_path)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
-        chunks = text_splitter.split_text(text=text)
-        self.vector_store = FAISS.from_texts(chunks, self.embeddings)
+        with tracing.span("rag.pdf_parse"):
+            pdf_reader = PdfReader(pdf_path)
+            text = ""
+            for page in pdf_reader.pages:
+                text += page.extract_text()
+
+        with tracing.span("rag.split"):
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200,
+                length_function=len
+            )
+            chunks = text_splitter.split_text(text=text)
+
+        # Embeds every chunk and builds the index
+        with tracing.span("rag.embed"):
+            self.vector_store = FAISS.from_texts(chunks, self.embeddings)
 
     def retrieve_context(self, query: str, top_k: int = 3) -> List[str]:
         """Retrieve most relevant chunks for a query"""
-        relevant_chunks = self.vector_store.similarity_search(query, k=top_k)
+        with tracing.span("rag.retrieve"):
+            relevant_chunks = self.vector_store.similarity_search(query, k=top_k)
         return [chunk.page_content for chunk in relevant_chunks]
 
     def generate_response(self, query: str, context: Optional[List[str]] = None) -> str:
@@ -73,13 +80,13 @@ class RAGSystem:
         """
         
         try:
-            response = self.model.generate_content(augmented_prompt)
+            response = self.model.generate_content(augmented_prompt, site="rag")
             return response.text
         except Exception as e:
             return f"Error generating response: {str(e)}"
 
 GOOGLE_AI_API_KEY = os.getenv('GOOGLE_AI_API_KEY')
-if not GOOGLE_AI_API_KEY:
+if not GOOGLE_AI_API_KEY and llm.requires_api_key():
     raise ValueError("GOOGLE_AI_API_KEY is not set in the .env file")
 
 # Document upload endpoint
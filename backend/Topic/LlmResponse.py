@@ -1,80 +1,241 @@
 import os
-import google.generativeai as genai
+import logging
+import threading
+import time
+from concurrent import futures
+from Common import llm, streaming
+from Topic import conversations, explanations
 
 # API Configuration
 api_key = os.getenv('GENAI_API_KEY')
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-1.5-flash')
+llm.configure(api_key)
+model = llm.get_model('gemini-1.5-flash')
 
-# Store short contexts for chat history
-short_contexts = ["test context ignore"]
+logger = logging.getLogger(__name__)
 
-# Function to get initial response based on the subject
-def get_response(subject):
-    prompt = f"""
+# Summarise a session's context once this many turns have piled up since the last summary
+# (capped so no turn drops out of the bounded history before it is summarised)
+SUMMARY_EVERY_TURNS = min(max(1, int(os.getenv('TOPIC_SUMMARY_EVERY_TURNS', '3'))),
+                          conversations.CONVERSATION_MAX_TURNS)
+_summary_pool = futures.ThreadPoolExecutor(max_workers=int(os.getenv('TOPIC_SUMMARY_WORKERS', '4')),
+                                           thread_name_prefix="topic-summary")
+# session id -> in-flight summary future
+_summarising = {}
+_summarising_lock = threading.Lock()
+
+# Bump whenever the topic prompt changes, so cached explanations are regenerated
+TOPIC_PROMPT_VERSION = 1
+explanation_cache = explanations.ExplanationCache(TOPIC_PROMPT_VERSION)
+
+# Largest `top` a warm-up request may ask for
+TOPIC_WARM_UP_MAX_TOP = int(os.getenv('TOPIC_WARM_UP_MAX_TOP', '200'))
+_warm_up_pool = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="topic-warmup-job")
+_warming_up = None
+_warming_up_lock = threading.Lock()
+
+def _topic_prompt(subject):
+    return f"""
     The user is visually impaired and has difficulty learning. They would like to learn about the subject: {subject}.
     Provide a brief description of the topic and suggest a follow-up question if the user would like to explore further.
     Highlight interesting aspects they could learn more about. Keep it concise and engaging.
 
     Response:
     """
+
+
+def _generate_explanation(subject):
+    response = model.generate_content(_topic_prompt(subject), site="topic_response")
+    if response and response.text:
+        text = response.text.strip()
+        explanation_cache.set(subject, text)
+        return text
+    return None
+
+
+# Function to get initial response based on the subject
+def get_response(subject):
+    explanations.log_request(subject)
+    cached = explanation_cache.get(subject)
+    if cached is not None:
+        return cached
     try:
-        response = model.generate_content(prompt)
-        if response and response.text:
-            return response.text.strip()
-        return "No response generated."
+        return _generate_explanation(subject) or "No response generated."
     except Exception as e:
         return f"An error occurred: {str(e)}"
 
 
-# Function to shorten and store chat context
-def shorten_context(user, ai,query):
+def get_response_stream(subject):
+    """Yield the topic explanation sentence by sentence as Gemini produces it."""
+    explanations.log_request(subject)
+    cached = explanation_cache.get(subject)
+    if cached is not None:
+        yield from streaming.sentences([cached])
+        return
+    response = model.generate_content(_topic_prompt(subject), site="topic_response", stream=True)
+    # The raw chunks are cached, not the sentences: those have lost their line breaks
+    raw = []
+
+    def record(chunks):
+        for chunk in chunks:
+            raw.append(chunk)
+            yield chunk
+
+    yield from streaming.sentences(record(streaming.iter_text(response)))
+    text = "".join(raw).strip()
+    if text:
+        explanation_cache.set(subject, text)
+
+
+def warm_up(top=50, days=30, workers=4):
+    """Generate explanations for the `top` most requested topics of the last `days` days that are not cached."""
+    since = time.time() - days * 24 * 3600 if days else None
+    popular = explanations.popular_topics(top, since)
+    missing = [topic for topic, _ in popular if topic not in explanation_cache]
+
+    def generate(topic):
+        try:
+            return _generate_explanation(topic) is not None
+        except Exception as e:
+            logger.warning(f"Could not warm up topic {topic!r}: {e}")
+            return False
+
+    with futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="topic-warmup") as pool:
+        generated = sum(pool.map(generate, missing))
+    logger.info(f"Topic warm-up: {len(popular)} popular, {len(missing)} missing, {generated} generated")
+    return {"popular": len(popular), "missing": len(missing), "generated": generated}
+
+
+def _warm_up_in_background(top, days):
+    try:
+        warm_up(top, days)
+    except Exception as e:
+        logger.warning(f"Topic warm-up failed: {e}")
+
+
+def schedule_warm_up(top=50, days=30):
+    """Run warm_up() in the background, one run at a time; returns (future, started)."""
+    global _warming_up
+    with _warming_up_lock:
+        if _warming_up is not None and not _warming_up.done():
+            return _warming_up, False
+        _warming_up = _warm_up_pool.submit(_warm_up_in_background, top, days)
+        return _warming_up, True
+
+
+# Function to fold the turns since the last summary into a new summary
+def shorten_context(summary, turns):
+    history = "\n".join(f"User: {user}\nAI: {ai}" for user, ai in turns)
     prompt = f"""
     The user is visually impaired and has difficulty learning.
     Based on the previous chat history:
-    context : {short_contexts[-1]}
-    User: {user}
-    AI: {ai}
-    current query : {query}
+    context : {summary}
+    {history}
 
     Summarize this interaction in 2-3 lines, making it precise and useful for context in future responses.
     """
     try:
-        response = model.generate_content(prompt)
+        response = model.generate_content(prompt, site="topic_context")
         if response and response.text:
-            short_contexts.append(response.text.strip())
             return response.text.strip()
-        return "Context could not be shortened."
     except Exception as e:
-        return f"An error occurred: {str(e)}"
+        logger.warning(f"Could not shorten context: {e}")
+    # Keep the previous summary rather than storing an error as context
+    return summary
 
 
-# Function to handle follow-up questions or new queries
-def ask_mor(user, ai, query):
+def _summarise(session_id):
     try:
-        # Summarize context if history exists
-        context = shorten_context(user, ai ,query) if short_contexts else ""
-        print(context)
-        
-        # Generate response
-        prompt = f"""
-        The user is visually impaired. Analyze the context carefully and respond based on it.
-        Context: {context}
-        new user Query: {query}
-        Provide a brief, friendly, and clear response. If the query is entirely new, handle it accordingly.
-        """
-        response = model.generate_content(prompt)
-        if response and response.text:
-            return {
-                "info": response.text.strip(),
-                "context": context
-            }
+        conversation = conversations.load(session_id)
+        turns = conversation.unsummarised()
+        if not turns:
+            return
+        summary = shorten_context(conversation.summary, turns)
+
+        def record(latest):
+            latest.summary = summary
+            latest.summarised_turns = conversation.turn_count
+        conversations.update(session_id, record)
+    finally:
+        with _summarising_lock:
+            _summarising.pop(session_id, None)
+
+
+def schedule_summary(session_id, force=False):
+    """Refresh the session's summary in the background, at most one run per session at a time."""
+    conversation = conversations.load(session_id)
+    pending = conversation.turn_count - conversation.summarised_turns
+    if pending <= 0 or (pending < SUMMARY_EVERY_TURNS and not force):
+        return None
+    with _summarising_lock:
+        if session_id in _summarising:
+            return _summarising[session_id]
+        future = _summary_pool.submit(_summarise, session_id)
+        _summarising[session_id] = future
+        return future
+
+
+def wait_for_summaries(timeout=None):
+    """Block until background summaries in flight have finished (for benchmarks and shutdown)."""
+    with _summarising_lock:
+        pending = list(_summarising.values())
+    futures.wait(pending, timeout=timeout)
+
+
+def _ask_more_prompt(user, ai, query, session_id):
+    """The stored summary and the answer prompt built from it and the unsummarised turns."""
+    conversation = conversations.load(session_id)
+    if conversation.turn_count == 0 and (user or ai):
+        # First follow-up: the previous exchange is the topic introduction
+        conversation = conversations.update(session_id, lambda c: c.add_turn(user or "", ai or ""))
+    context = conversation.summary
+    recent = "\n".join(f"User: {turn_user}\nAI: {turn_ai}" for turn_user, turn_ai in conversation.unsummarised())
+    logger.debug(f"ask_more context: {context}")
+
+    prompt = f"""
+    The user is visually impaired. Analyze the context carefully and respond based on it.
+    Context: {context}
+    Recent conversation:
+    {recent}
+    new user Query: {query}
+    Provide a brief, friendly, and clear response. If the query is entirely new, handle it accordingly.
+    """
+    return context, prompt
+
+
+def _record_turn(session_id, query, info):
+    conversations.update(session_id, lambda c: c.add_turn(query, info))
+    schedule_summary(session_id)
+
+
+# Function to handle follow-up questions or new queries within one session
+def ask_mor(user, ai, query, session_id):
+    """
+    Answer from the stored summary plus the turns it does not cover yet, in a
+    single Gemini call. The summary is refreshed afterwards in the background
+    every SUMMARY_EVERY_TURNS turns, off the user's critical path.
+    """
+    try:
+        context, prompt = _ask_more_prompt(user, ai, query, session_id)
+        response = model.generate_content(prompt, site="topic_ask_more")
+        info = response.text.strip() if response and response.text else "I'm not sure about that."
+        _record_turn(session_id, query, info)
         return {
-            "info": "I'm not sure about that.",
+            "info": info,
             "context": context
         }
     except Exception as e:
         return {
             "info": f"Sorry, an error occurred: {str(e)}",
             "context": ""
-        }
\ No newline at end of file
+        }
+
+
+def ask_mor_stream(user, ai, query, session_id):
+    """Streaming ask_mor: yields the answer sentence by sentence, then records the turn."""
+    context, prompt = _ask_more_prompt(user, ai, query, session_id)
+    response = model.generate_content(prompt, site="topic_ask_more", stream=True)
+    parts = []
+    for sentence in streaming.sentences(streaming.iter_text(response)):
+        parts.append(sentence)
+        yield sentence
+    _record_turn(session_id, query, " ".join(parts) or "I'm not sure about that.")
@@ -0,0 +1,142 @@
+"""
+Per-session conversation state for the Topic ask_more flow.
+
+Each session keeps a running summary plus its last CONVERSATION_MAX_TURNS
+(query, answer) turns, so no conversation can grow without bound. The summary
+may lag behind the turns (it is refreshed in the background, see
+Topic/LlmResponse.py); unsummarised() is what it does not cover yet. Sessions
+expire CONVERSATION_TTL seconds after their last update.
+
+CONVERSATION_BACKEND=memory   per-process TTL cache holding at most
+                              CONVERSATION_MAX_SESSIONS sessions (default)
+CONVERSATION_BACKEND=sqlite   Common.store table, shared by every worker
+                              process and kept across restarts
+
+    conversation = conversations.load(session_id)
+    conversations.update(session_id, lambda c: c.add_turn(query, answer))
+"""
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from Common.store import KeyValueStore
+
+CONVERSATION_BACKEND = os.getenv("CONVERSATION_BACKEND", "memory").lower()
+CONVERSATION_TTL = float(os.getenv("CONVERSATION_TTL", str(2 * 3600)))
+CONVERSATION_MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", "6"))
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "10000"))
+
+
+class Conversation:
+    def __init__(self, summary: str = "", turns=(), turn_count: int = 0, summarised_turns: int = 0):
+        self.summary = summary
+        self.turns = deque((tuple(turn) for turn in turns), maxlen=CONVERSATION_MAX_TURNS)
+        # All turns ever added, including those that have dropped out of `turns`
+        self.turn_count = turn_count
+        # turn_count when the summary was last brought up to date
+        self.summarised_turns = summarised_turns
+
+    def add_turn(self, query: str, answer: str) -> None:
+        self.turns.append((query, answer))
+        self.turn_count += 1
+
+    def unsummarised(self) -> List[Tuple[str, str]]:
+        """Stored turns newer than the summary, oldest first."""
+        pending = min(self.turn_count - self.summarised_turns, len(self.turns))
+        return list(self.turns)[len(self.turns) - pending:] if pending > 0 else []
+
+    def to_dict(self) -> dict:
+        return {"summary": self.summary, "turns": [list(turn) for turn in self.turns],
+                "turn_count": self.turn_count, "summarised_turns": self.summarised_turns}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Conversation":
+        return cls(data.get("summary", ""), data.get("turns", ()),
+                   data.get("turn_count", 0), data.get("summarised_turns", 0))
+
+
+class MemoryBackend:
+    def __init__(self, ttl: float = CONVERSATION_TTL, max_sessions: int = CONVERSATION_MAX_SESSIONS):
+        self._cache = TTLCache(maxsize=max_sessions, ttl=ttl)
+
+    def get(self, session_id: str) -> Optional[dict]:
+        return self._cache.get(session_id)
+
+    def set(self, session_id: str, data: dict) -> None:
+        self._cache[session_id] = data
+
+    def __len__(self) -> int:
+        self._cache.expire()
+        return len(self._cache)
+
+
+class SqliteBackend:
+    def __init__(self, ttl: float = CONVERSATION_TTL):
+        self._store = KeyValueStore("topic_conversations", ttl=ttl)
+
+    def get(self, session_id: str) -> Optional[dict]:
+        return self._store.get(session_id)
+
+    def set(self, session_id: str, data: dict) -> None:
+        self._store.set(session_id, data)
+
+    def __len__(self) -> int:
+        self._store.purge_expired()
+        return len(self._store)
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "sqlite": SqliteBackend,
+}
+
+
+class ConversationStore:
+    def __init__(self, backend):
+        self.backend = backend
+        # Serialises read-modify-write cycles; the backends themselves are not thread-safe
+        self.lock = threading.RLock()
+
+    def load(self, session_id: str) -> Conversation:
+        with self.lock:
+            data = self.backend.get(session_id)
+        return Conversation.from_dict(data) if data else Conversation()
+
+    def update(self, session_id: str, change: Callable[[Conversation], None]) -> Conversation:
+        """Apply change() to the stored conversation and save it (refreshing its TTL)."""
+        with self.lock:
+            data = self.backend.get(session_id)
+            conversation = Conversation.from_dict(data) if data else Conversation()
+            change(conversation)
+            self.backend.set(session_id, conversation.to_dict())
+            return conversation
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.backend)
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+def create_store(name: str = CONVERSATION_BACKEND) -> ConversationStore:
+    try:
+        return ConversationStore(BACKENDS[name]())
+    except KeyError:
+        raise ValueError(f"Unknown CONVERSATION_BACKEND {name!r}, expected one of {sorted(BACKENDS)}") from None
+
+
+store = create_store()
+
+
+def load(session_id: str) -> Conversation:
+    return store.load(session_id)
+
+
+def update(session_id: str, change: Callable[[Conversation], None]) -> Conversation:
+    return store.update(session_id, change)
@@ -0,0 +1,180 @@
+"""
+Cache of generated topic explanations.
+
+Curriculum topics repeat heavily across students, so get_response() looks the
+normalised topic up here before calling Gemini. Two tiers, both expiring
+entries TOPIC_CACHE_TTL seconds after they were generated:
+
+  memory   per-process LRU holding at most TOPIC_CACHE_MAX_ENTRIES topics
+  sqlite   Common.store table shared by every worker process and kept across
+           restarts; a hit there is promoted into the memory tier
+
+Every topic request is also recorded in the topic_requests table of the same
+SQLite database, shared by every worker process. Requests older than
+TOPIC_ACCESS_LOG_DAYS are deleted as new ones come in (at most once every
+TOPIC_ACCESS_PRUNE_SECONDS per process). warm_up() in Topic/LlmResponse.py
+reads the counts back through popular_topics() and pre-generates the most
+requested topics that are not cached yet, e.g. nightly from cron (run from
+backend/):
+
+    python -m Topic.explanations --top 50 --days 30
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from Common import tracing
+from Common.store import KeyValueStore, connect
+
+TOPIC_CACHE_TTL = float(os.getenv("TOPIC_CACHE_TTL", str(7 * 24 * 3600)))
+TOPIC_CACHE_MAX_ENTRIES = int(os.getenv("TOPIC_CACHE_MAX_ENTRIES", "2000"))
+# Requests older than this are pruned from the request log; also the longest warm-up window
+TOPIC_ACCESS_LOG_DAYS = float(os.getenv("TOPIC_ACCESS_LOG_DAYS", "90"))
+TOPIC_ACCESS_PRUNE_SECONDS = float(os.getenv("TOPIC_ACCESS_PRUNE_SECONDS", "3600"))
+
+LOOKUPS = tracing.counter("backend_topic_cache_lookups_total", "Topic explanation cache lookups by result")
+
+# Leading phrases that do not change what is being asked about
+_FILLER = re.compile(r"^(?:(?:tell me|teach me|explain|learn)(?: about)?|what (?:is|are)|about|the|an?)\s+")
+
+
+def normalise_topic(subject: str) -> str:
+    """'  What is  Photosynthesis? ' and 'photosynthesis' share one cache entry."""
+    topic = re.sub(r"[^\w\s'-]", " ", (subject or "").casefold())
+    topic = " ".join(topic.split())
+    previous = None
+    while topic != previous:
+        previous = topic
+        topic = _FILLER.sub("", topic)
+    return topic
+
+
+class ExplanationCache:
+    def __init__(self, version: int, ttl: float = TOPIC_CACHE_TTL,
+                 max_entries: int = TOPIC_CACHE_MAX_ENTRIES, path: Optional[str] = None):
+        # Part of every key: bumping it retires explanations from an older prompt
+        self.version = version
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=max_entries, ttl=ttl)
+        self.store = KeyValueStore("topic_explanations", path=path, ttl=ttl)
+        self.lock = threading.Lock()
+
+    def key(self, subject: str) -> str:
+        return f"v{self.version}:{normalise_topic(subject)}"
+
+    def _lookup(self, key: str) -> Tuple[Optional[str], str]:
+        with self.lock:
+            text = self.memory.get(key)
+        if text is not None:
+            return text, "memory"
+        entry = self.store.get(key)
+        if entry is None:
+            return None, "miss"
+        with self.lock:
+            self.memory[key] = entry["text"]
+        return entry["text"], "store"
+
+    def get(self, subject: str) -> Optional[str]:
+        text, result = self._lookup(self.key(subject))
+        LOOKUPS.inc(result=result)
+        return text
+
+    def set(self, subject: str, text: str) -> None:
+        key = self.key(subject)
+        with self.lock:
+            self.memory[key] = text
+        self.store.set(key, {"topic": subject, "text": text, "generated_at": time.time()})
+
+    def __contains__(self, subject: str) -> bool:
+        # Not counted in LOOKUPS, so warm-up does not skew the hit ratio
+        return self._lookup(self.key(subject))[0] is not None
+
+    def __len__(self) -> int:
+        self.store.purge_expired()
+        return len(self.store)
+
+
+class RequestLog:
+    """Topic requests with their time, for popularity counts over a recent window."""
+
+    def __init__(self, path: Optional[str] = None, retention_days: float = TOPIC_ACCESS_LOG_DAYS):
+        self.retention = retention_days * 24 * 3600
+        self.connection, self.lock = connect(path)
+        self._pruned_at = 0.0
+        with self.lock:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS topic_requests ("
+                "ts REAL NOT NULL, topic TEXT NOT NULL, asked_as TEXT NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS topic_requests_ts ON topic_requests (ts)")
+
+    def log(self, subject: str) -> None:
+        topic = normalise_topic(subject)
+        if not topic:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.execute("INSERT INTO topic_requests (ts, topic, asked_as) VALUES (?, ?, ?)",
+                                    (now, topic, " ".join(subject.split())))
+            prune = now - self._pruned_at >= TOPIC_ACCESS_PRUNE_SECONDS
+            if prune:
+                self._pruned_at = now
+        if prune:
+            self.prune(now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete requests older than the retention window; returns how many."""
+        cutoff = (now or time.time()) - self.retention
+        with self.lock:
+            return self.connection.execute("DELETE FROM topic_requests WHERE ts < ?", (cutoff,)).rowcount
+
+    def popular(self, limit: int, since: Optional[float] = None) -> List[Tuple[str, int]]:
+        since = max(since or 0.0, time.time() - self.retention)
+        with self.lock:
+            # SQLite takes the bare asked_as column from the row holding MIN(ts)
+            rows = self.connection.execute(
+                "SELECT asked_as, COUNT(*) AS requests, MIN(ts) FROM topic_requests WHERE ts >= ? "
+                "GROUP BY topic ORDER BY requests DESC, topic LIMIT ?", (since, limit)
+            ).fetchall()
+        return [(asked_as, requests) for asked_as, requests, _ in rows]
+
+
+request_log = RequestLog()
+
+
+def log_request(subject: str) -> None:
+    """Record one topic request for popular_topics()."""
+    try:
+        request_log.log(subject)
+    except sqlite3.Error:
+        # Popularity tracking must never fail a request
+        pass
+
+
+def popular_topics(limit: int, since: Optional[float] = None) -> List[Tuple[str, int]]:
+    """The `limit` most requested normalised topics as (topic as first asked, request count)."""
+    return request_log.popular(limit, since)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate explanations for the most requested topics")
+    parser.add_argument("--top", type=int, default=50, help="number of topics to keep warm")
+    parser.add_argument("--days", type=float, default=30, help="only count requests this recent (0 = all kept)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    from Topic import LlmResponse
+
+    result = LlmResponse.warm_up(args.top, args.days, args.workers)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
+# Run from backend/ with: python -m YoutubeBraille.app
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from utils import YouTubeBrailleTranslator
+from YoutubeBraille.utils import YouTubeBrailleTranslator, DEFAULT_LANGUAGE, LANGUAGE_CODE
 
 app = Flask(__name__)
 CORS(app)
@@ -10,6 +11,12 @@ def translate_to_braille():
     video_url = request.args.get('url')
     if not video_url:
         return jsonify({"error": "No URL provided"}), 400
+    grade = request.args.get('grade', type=int)
+    if grade not in (None, 1, 2):
+        return jsonify({"error": "grade must be 1 or 2"}), 400
+    language = request.args.get('lang', DEFAULT_LANGUAGE)
+    if not LANGUAGE_CODE.fullmatch(language):
+        return jsonify({"error": "Invalid language code"}), 400
     
     translator = YouTubeBrailleTranslator()
     video_id = translator.extract_video_id(video_url)
@@ -18,7 +25,7 @@ def translate_to_braille():
         return jsonify({"error": "Invalid YouTube URL"}), 400
     
     # Translate transcript to Braille
-    braille_text = translator.translate_transcript_to_braille(video_id)
+    braille_text = translator.translate_transcript_to_braille(video_id, grade, language)
     
     if not braille_text:
         return jsonify({"error": "Braille translation failed"}), 500
@@ -0,0 +1,218 @@
+"""
+Table-driven English Braille (UEB) translation.
+
+    from YoutubeBraille import braille
+
+    braille.translate("Chapter 3: The Atom", grade=2)
+
+Grade 1 is letter for letter: capitals get the capital indicator (a whole
+upper-case word gets the capital word indicator), numbers get the numeric
+indicator, and punctuation has its own cells instead of blanks. Grade 2 adds
+contractions: whole-word signs ("the", "knowledge", initial-letter words such
+as "day") and groupsigns inside words ("ch", "ing", "st"...). Groupsigns are
+matched longest-first with a trie that knows where in a word each sign may
+appear. This is a practical subset of UEB contraction rules, not a certified
+transcriber.
+
+The work is done by a few regex passes and one str.translate() over the whole
+text. Grade 2 words go through an LRU cache, because transcripts repeat the
+same few thousand words over and over.
+"""
+import functools
+import os
+import re
+import unicodedata
+from typing import Dict, Tuple
+
+BRAILLE_GRADE = int(os.getenv("BRAILLE_GRADE", "1"))
+
+
+def cells(*dot_groups: str) -> str:
+    """Braille cells from dot numbers, e.g. cells("6", "1") -> capital A."""
+    return "".join(chr(0x2800 + sum(1 << (int(dot) - 1) for dot in dots)) for dots in dot_groups)
+
+
+BLANK = cells("")
+LETTERS = dict(zip("abcdefghijklmnopqrstuvwxyz", (cells(dots) for dots in (
+    "1", "12", "14", "145", "15", "124", "1245", "125", "24", "245",
+    "13", "123", "134", "1345", "135", "1234", "12345", "1235", "234", "2345",
+    "136", "1236", "2456", "1346", "13456", "1356",
+))))
+DIGITS = {digit: LETTERS[letter] for digit, letter in zip("1234567890", "abcdefghij")}
+
+NUMERIC_INDICATOR = cells("3456")
+CAPITAL_INDICATOR = cells("6")
+CAPITAL_WORD_INDICATOR = cells("6", "6")
+GRADE1_INDICATOR = cells("56")
+
+PUNCTUATION = {
+    ",": cells("2"), ";": cells("23"), ":": cells("25"), ".": cells("256"), "!": cells("235"),
+    "?": cells("236"), "'": cells("3"), "-": cells("36"), '"': cells("6", "2356"),
+    "(": cells("5", "126"), ")": cells("5", "345"), "[": cells("46", "126"), "]": cells("46", "345"),
+    "/": cells("456", "34"), "&": cells("4", "12346"), "@": cells("4", "1"), "%": cells("46", "356"),
+    "$": cells("4", "234"), "+": cells("5", "235"), "=": cells("5", "2356"), "*": cells("5", "35"),
+    "#": cells("456", "1456"), "‘": cells("3"), "’": cells("3"),
+    "“": cells("6", "2356"), "”": cells("6", "2356"), "–": cells("6", "36"),
+    "—": cells("6", "36"), "…": cells("256", "256", "256"),
+}
+
+# Private-use stand-ins for indicators, inserted by the regex passes and expanded by the table
+_NUMBER_MARK, _CAPITAL_MARK, _GRADE1_MARK = "\ue000", "\ue001", "\ue002"
+
+_TABLE = str.maketrans({
+    **LETTERS, **DIGITS, **PUNCTUATION,
+    " ": BLANK, "\t": BLANK, "\r": None,
+    _NUMBER_MARK: NUMERIC_INDICATOR, _CAPITAL_MARK: CAPITAL_INDICATOR, _GRADE1_MARK: GRADE1_INDICATOR,
+})
+
+# Whole words only (standing alone)
+WORDSIGNS = {
+    # Alphabetic wordsigns
+    "but": "12", "can": "14", "do": "145", "every": "15", "from": "124", "go": "1245", "have": "125",
+    "just": "245", "knowledge": "13", "like": "123", "more": "134", "not": "1345", "people": "1234",
+    "quite": "12345", "rather": "1235", "so": "234", "that": "2345", "us": "136", "very": "1236",
+    "will": "2456", "it": "1346", "you": "13456", "as": "1356",
+    # Strong contractions and wordsigns
+    "and": "12346", "for": "123456", "of": "12356", "the": "2346", "with": "23456",
+    "child": "16", "shall": "146", "this": "1456", "which": "156", "out": "1256", "still": "34",
+    # Lower wordsigns
+    "be": "23", "enough": "26", "were": "2356", "his": "236", "in": "35", "was": "356",
+    # Initial-letter contractions
+    "day": "5 145", "ever": "5 15", "father": "5 124", "here": "5 125", "know": "5 13", "lord": "5 123",
+    "mother": "5 134", "name": "5 1345", "one": "5 135", "part": "5 1234", "question": "5 12345",
+    "right": "5 1235", "some": "5 234", "time": "5 2345", "under": "5 136", "work": "5 2456",
+    "young": "5 13456", "there": "5 2346", "character": "5 16", "through": "5 1456", "where": "5 156",
+    "ought": "5 1256", "upon": "45 136", "word": "45 2456", "these": "45 2346", "those": "45 1456",
+    "whose": "45 156", "cannot": "456 14", "had": "456 125", "many": "456 134", "spirit": "456 234",
+    "their": "456 2346", "world": "456 2456",
+}
+WORDSIGNS = {word: cells(*dots.split()) for word, dots in WORDSIGNS.items()}
+
+ANYWHERE, START, MIDDLE, NOT_START = "anywhere", "start", "middle", "not_start"
+
+# Groupsigns inside words, with where in the word they may be used
+GROUPSIGNS = {
+    "and": ("12346", ANYWHERE), "for": ("123456", ANYWHERE), "of": ("12356", ANYWHERE),
+    "the": ("2346", ANYWHERE), "with": ("23456", ANYWHERE),
+    "ch": ("16", ANYWHERE), "gh": ("126", ANYWHERE), "sh": ("146", ANYWHERE), "th": ("1456", ANYWHERE),
+    "wh": ("156", ANYWHERE), "ed": ("1246", ANYWHERE), "er": ("12456", ANYWHERE), "ou": ("1256", ANYWHERE),
+    "ow": ("246", ANYWHERE), "st": ("34", ANYWHERE), "ar": ("345", ANYWHERE), "ing": ("346", NOT_START),
+    "en": ("26", ANYWHERE), "in": ("35", ANYWHERE),
+    "be": ("23", START), "con": ("25", START), "dis": ("256", START),
+    "ea": ("2", MIDDLE), "bb": ("23", MIDDLE), "cc": ("25", MIDDLE), "ff": ("235", MIDDLE), "gg": ("2356", MIDDLE),
+}
+
+
+class ContractionTrie:
+    def __init__(self, signs: Dict[str, Tuple[str, str]]):
+        self.root = {}
+        for letters, (dots, position) in signs.items():
+            node = self.root
+            for letter in letters:
+                node = node.setdefault(letter, {})
+            node[None] = (cells(dots), position)
+
+    def longest_match(self, word: str, start: int):
+        """(cell, length) of the longest sign allowed at word[start:], or None."""
+        best = None
+        node = self.root
+        for end in range(start, len(word)):
+            node = node.get(word[end])
+            if node is None:
+                break
+            if None in node:
+                sign, position = node[None]
+                length = end + 1 - start
+                last = end == len(word) - 1
+                if (position == ANYWHERE
+                        or (position == START and start == 0 and not last)
+                        or (position == MIDDLE and start > 0 and not last)
+                        or (position == NOT_START and start > 0)):
+                    best = (sign, length)
+        return best
+
+
+_TRIE = ContractionTrie(GROUPSIGNS)
+
+_NUMBER = re.compile(r"(\d+(?:[.,]\d+)*)(?=([a-j])?)")
+_CAPITAL_WORD = re.compile(r"\b[A-Z]{2,}\b")
+_CAPITAL = re.compile(r"[A-Z]")
+_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+_COMBINING = re.compile("[\u0300-\u036f]")
+_UNKNOWN = re.compile("[^\u2800-\u28ff\n]")
+
+
+@functools.lru_cache(maxsize=65536)
+def contract(word: str) -> str:
+    """Grade 2 cells for one lower-case word (letters and apostrophes only)."""
+    if "'" in word:
+        # e.g. "don't": contract each piece, no wordsigns
+        return PUNCTUATION["'"].join(_contract_letters(piece) for piece in word.split("'"))
+    sign = WORDSIGNS.get(word)
+    if sign is not None:
+        return sign
+    if len(word) == 1 and word not in "aio":
+        # A lone letter would otherwise read as its wordsign
+        return GRADE1_INDICATOR + LETTERS[word]
+    return _contract_letters(word)
+
+
+def _contract_letters(word: str) -> str:
+    out = []
+    i = 0
+    while i < len(word):
+        match = _TRIE.longest_match(word, i)
+        if match:
+            out.append(match[0])
+            i += match[1]
+        else:
+            out.append(LETTERS[word[i]])
+            i += 1
+    return "".join(out)
+
+
+def _grade2_word(match) -> str:
+    word = match.group()
+    before = match.string[match.start() - 1] if match.start() else ""
+    if before == _GRADE1_MARK or before.isdigit():
+        # Letters straight after a number ("2024b", "3rd") are not a word of their own
+        return _uncontracted(word)
+    if word.islower():
+        return contract(word)
+    lower = word.lower()
+    if len(word) == 1:
+        # Capital lone letter: the grade 1 indicator goes before the capital indicator
+        return (GRADE1_INDICATOR if lower not in "aio" else "") + CAPITAL_INDICATOR + LETTERS[lower]
+    if word.isupper():
+        return CAPITAL_WORD_INDICATOR + contract(lower)
+    if word[0].isupper() and word[1:].islower():
+        return CAPITAL_INDICATOR + contract(lower)
+    # Mixed case ("iPhone"): letter for letter
+    return _uncontracted(word)
+
+
+def _uncontracted(word: str) -> str:
+    return "".join(CAPITAL_INDICATOR + LETTERS[char.lower()] if char.isupper() else char
+                   for char in word).translate(_TABLE)
+
+
+def _number(match) -> str:
+    # A letter a-j straight after a number would read as another digit
+    return _NUMBER_MARK + match.group(1) + (_GRADE1_MARK if match.group(2) else "")
+
+
+def translate(text: str, grade: int = BRAILLE_GRADE) -> str:
+    """Unicode Braille for text; line breaks are kept, characters without a cell become blanks."""
+    if not text:
+        return ""
+    if not text.isascii():
+        # Accented letters fall back to their base letter
+        text = _COMBINING.sub("", unicodedata.normalize("NFKD", text))
+    text = _NUMBER.sub(_number, text)
+    if grade == 2:
+        text = _WORD.sub(_grade2_word, text)
+    else:
+        text = _CAPITAL_WORD.sub(lambda match: _CAPITAL_MARK * 2 + match.group().lower(), text)
+        text = _CAPITAL.sub(lambda match: _CAPITAL_MARK + match.group().lower(), text)
+    text = text.translate(_TABLE)
+    return _UNKNOWN.sub(BLANK, text)
@@ -0,0 +1,168 @@
+"""
+Cache of YouTube transcripts and their Braille translations.
+
+A whole class opens the same lecture, so transcripts are fetched from YouTube
+once per (video id, language) and kept for YOUTUBE_CACHE_TTL seconds, together
+with the Braille text of every grade asked for so far. Two tiers:
+
+  memory   per-process LRU holding at most YOUTUBE_CACHE_MAX_ENTRIES videos
+  sqlite   Common.store table shared by every worker process and kept across
+           restarts; a hit there is promoted into the memory tier
+
+Concurrent first requests for the same video share one fetch: the first caller
+fetches, the others wait for its result instead of hitting YouTube too.
+Failed fetches are not cached, so a transcript published later is picked up.
+
+stats() (served on /api/youtube-braille/cache-stats) counts lookups by tier,
+shared fetches and fetch errors since process start.
+"""
+import os
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from Common import tracing
+from Common.store import KeyValueStore
+
+YOUTUBE_CACHE_TTL = float(os.getenv("YOUTUBE_CACHE_TTL", str(7 * 24 * 3600)))
+YOUTUBE_CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "200"))
+# Part of the Braille keys: bump it when the Braille engine's output changes
+BRAILLE_VERSION = 1
+
+LOOKUPS = tracing.counter("backend_youtube_cache_lookups_total", "YouTube transcript cache lookups by result")
+FETCHES = tracing.counter("backend_youtube_transcript_fetches_total", "YouTube transcript fetches by result")
+
+
+class TranscriptCache:
+    def __init__(self, ttl: float = YOUTUBE_CACHE_TTL, max_entries: int = YOUTUBE_CACHE_MAX_ENTRIES,
+                 path: Optional[str] = None):
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=max_entries, ttl=ttl)
+        self.store = KeyValueStore("youtube_transcripts", path=path, ttl=ttl)
+        self.lock = threading.Lock()
+        # cache key -> future of the fetch in flight
+        self._fetching: Dict[str, futures.Future] = {}
+        self._stats = {"memory": 0, "store": 0, "miss": 0, "shared": 0, "fetched": 0, "fetch_errors": 0}
+
+    @staticmethod
+    def key(video_id: str, language: str) -> str:
+        return f"{video_id}:{language.lower()}"
+
+    def _count(self, result: str) -> None:
+        with self.lock:
+            self._stats[result] += 1
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.memory.get(key)
+        if entry is not None:
+            self._count("memory")
+            LOOKUPS.inc(result="memory")
+            return entry
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        with self.lock:
+            self.memory[key] = entry
+        self._count("store")
+        LOOKUPS.inc(result="store")
+        return entry
+
+    def _save(self, key: str, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            self.memory[key] = entry
+        # Expiry runs from the fetch, not from the latest Braille grade added
+        remaining = entry["fetched_at"] + self.ttl - time.time()
+        self.store.set(key, entry, ttl=max(remaining, 1))
+
+    def transcript_entry(self, video_id: str, language: str,
+                         fetch: Callable[[], Optional[List[Dict]]]) -> Optional[Dict[str, Any]]:
+        """
+        The cached entry ({video_id, language, transcript, braille, fetched_at}),
+        calling fetch() on a miss. None when there is no transcript.
+        """
+        key = self.key(video_id, language)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+
+        with self.lock:
+            future = self._fetching.get(key)
+            owner = future is None
+            if owner:
+                future = self._fetching[key] = futures.Future()
+        if not owner:
+            self._count("shared")
+            LOOKUPS.inc(result="shared")
+            return future.result()
+
+        try:
+            # Another caller may have finished the fetch between our lookup and taking it over
+            entry = self._lookup(key)
+            if entry is None:
+                self._count("miss")
+                LOOKUPS.inc(result="miss")
+                entry = self._fetch(key, video_id, language, fetch)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self._fetching.pop(key, None)
+
+    def _fetch(self, key, video_id, language, fetch) -> Optional[Dict[str, Any]]:
+        try:
+            transcript = fetch()
+        except Exception:
+            self._count("fetch_errors")
+            FETCHES.inc(result="error")
+            raise
+        if not transcript:
+            self._count("fetch_errors")
+            FETCHES.inc(result="empty")
+            return None
+        self._count("fetched")
+        FETCHES.inc(result="ok")
+        entry = {
+            "video_id": video_id,
+            "language": language,
+            "transcript": transcript,
+            "braille": {},
+            "fetched_at": time.time(),
+        }
+        self._save(key, entry)
+        return entry
+
+    def braille(self, entry: Dict[str, Any], grade: int, translate: Callable[[str], str]) -> str:
+        """The entry's Braille text for one grade, translated and stored on first use."""
+        grade_key = f"v{BRAILLE_VERSION}:g{grade}"
+        text = entry["braille"].get(grade_key)
+        if text is None:
+            text = translate(transcript_text(entry["transcript"]))
+            entry = {**entry, "braille": {**entry["braille"], grade_key: text}}
+            self._save(self.key(entry["video_id"], entry["language"]), entry)
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self._stats)
+            result["memory_entries"] = len(self.memory)
+            result["fetching"] = len(self._fetching)
+        lookups = result["memory"] + result["store"] + result["miss"] + result["shared"]
+        # Shared fetches count as hits: they did not call YouTube themselves
+        result["hit_ratio"] = (lookups - result["miss"]) / lookups if lookups else 0.0
+        self.store.purge_expired()
+        result["stored_entries"] = len(self.store)
+        return result
+
+
+def transcript_text(transcript: List[Dict]) -> str:
+    return "\n".join(e['text'] for e in transcript)
+
+
+transcripts = TranscriptCache()
@@ -1,31 +1,33 @@
 import re
 from typing import Dict, Optional, List
 from youtube_transcript_api import YouTubeTranscriptApi
+from YoutubeBraille import braille
+from YoutubeBraille.transcripts import transcript_text, transcripts
 
-class BrailleConverter:
-    BRAILLE_MAP = {
-        'a': '⠁', 'b': '⠃', 'c': '⠉', 'd': '⠙', 'e': '⠑', 
-        'f': '⠋', 'g': '⠛', 'h': '⠓', 'i': '⠊', 'j': '⠚',
-        'k': '⠅', 'l': '⠇', 'm': '⠍', 'n': '⠝', 'o': '⠕', 
-        'p': '⠏', 'q': '⠟', 'r': '⠗', 's': '⠎', 't': '⠞',
-        'u': '⠥', 'v': '⠧', 'w': '⠺', 'x': '⠭', 'y': '⠽', 
-        'z': '⠵',
-        ' ': '⠀', '.': '⠲', ',': '⠂', '!': '⠖',
-        # Add more characters as needed
-    }
+DEFAULT_LANGUAGE = 'en'
+# Caption language codes such as 'en', 'hi', 'pt-BR', 'zh-Hans'
+LANGUAGE_CODE = re.compile(r'[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,8})?')
 
+class BrailleConverter:
     @classmethod
-    def to_braille(cls, text: str) -> str:
-        braille_text = [cls.BRAILLE_MAP.get(char.lower(), '⠀') for char in text]
-        return ''.join(braille_text)
+    def to_braille(cls, text: str, grade: Optional[int] = None) -> str:
+        return braille.translate(text, grade or braille.BRAILLE_GRADE)
 
 class YouTubeBrailleTranslator:
-    def get_video_transcript(self, video_id: str) -> Optional[List[Dict]]:
+    def fetch_video_transcript(self, video_id: str, language: str = DEFAULT_LANGUAGE) -> Optional[List[Dict]]:
         try:
-            return YouTubeTranscriptApi.get_transcript(video_id)
+            return YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
         except Exception as e:
             return None
 
+    def get_video_transcript(self, video_id: str, language: str = DEFAULT_LANGUAGE) -> Optional[List[Dict]]:
+        entry = self._cached(video_id, language)
+        return entry["transcript"] if entry else None
+
+    def _cached(self, video_id: str, language: str):
+        return transcripts.transcript_entry(video_id, language,
+                                            lambda: self.fetch_video_transcript(video_id, language))
+
     def extract_video_id(self, url: str) -> Optional[str]:
         patterns = [
             r'(?:https?:\/\/)?youtu\.be\/([^&\s]+)',
@@ -37,14 +39,19 @@ class YouTubeBrailleTranslator:
                 return match.group(1)
         return None
 
-    def translate_transcript_to_braille(self, video_id: str) -> Dict[str, str]:
-        transcript = self.get_video_transcript(video_id)
-        if not transcript:
+    def translate_transcript_to_braille(self, video_id: str, grade: Optional[int] = None,
+                                        language: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
+        grade = grade or braille.BRAILLE_GRADE
+        entry = self._cached(video_id, language)
+        if not entry:
+            message = "Could not retrieve transcript."
             return {
-                "original_transcript": "Could not retrieve transcript.",
-                "braille_transcript": "⠉⠕⠥⠇⠙⠀⠝⠕⠞⠀⠗⠑⠞⠗⠊⠑⠧⠑⠀⠞⠗⠁⠝⠎⠉⠗⠊⠏⠞⠲"
+                "original_transcript": message,
+                "braille_transcript": BrailleConverter.to_braille(message, grade)
             }
         return {
-            "original_transcript": "\n".join(e['text'] for e in transcript),
-            "braille_transcript": "\n".join(BrailleConverter.to_braille(e['text']) for e in transcript),
+            "original_transcript": transcript_text(entry["transcript"]),
+            # One pass over the whole transcript, cached per grade; line breaks survive translation
+            "braille_transcript": transcripts.braille(entry, grade,
+                                                      lambda text: BrailleConverter.to_braille(text, grade)),
         }
@@ -1,8 +1,14 @@
-from flask import Flask, request, jsonify, Response, stream_with_context
+from flask import Flask, request, jsonify, Response, stream_with_context, send_from_directory
 from flask_cors import CORS
 import os
+import logging
 from dotenv import load_dotenv
-from Topic.LlmResponse import get_response, ask_mor
+
+# Before the project imports: Common.llm and others read their settings at import time
+load_dotenv()
+
+from Topic.LlmResponse import get_response, ask_mor, get_response_stream, ask_mor_stream, schedule_warm_up, TOPIC_WARM_UP_MAX_TOP
+from Topic import conversations
 import tempfile
 import uuid
 from SignLanguage.sentenceToSignLanguage import fail_safe_translate, model
@@ -13,15 +19,23 @@ import io
 import json
 
 from pathlib import Path
-import google.generativeai as genai
+from Common import llm, tracing, uploads
 from werkzeug.utils import secure_filename
 from TalkToPDF.rag import RAGSystem, allowed_file
-import re
-from PPTtoVideo.PPT_Script import generate_scripts  # Add this import
-from YoutubeBraille.utils import YouTubeBrailleTranslator  # Add this import
+from PPTtoVideo.PPT_Script import generate_scripts, iter_slides, PipelineStats
+from PPTtoVideo import storage as ppt_storage, video as ppt_video
+from YoutubeBraille.utils import YouTubeBrailleTranslator, DEFAULT_LANGUAGE, LANGUAGE_CODE
+from YoutubeBraille.transcripts import transcripts as youtube_transcripts
+from MCQ_generator import generator as mcq
 
 app = Flask(__name__)
 CORS(app)
+tracing.init_app(app)
+uploads.init_app(app)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # scene description
 UPLOAD_FOLDER = "uploads"
@@ -37,14 +51,19 @@ PPT_UPLOAD_FOLDER = 'uploads'
 PPT_ALLOWED_EXTENSIONS = {'ppt', 'pptx'}
 os.makedirs(PPT_UPLOAD_FOLDER, exist_ok=True)
 
-# Load environment variables and configure Gemini AI
-load_dotenv()
+# Per-endpoint request body limits
+MB = 1024 * 1024
+PPT_UPLOAD_LIMIT = int(os.getenv('PPT_UPLOAD_LIMIT_MB', '50')) * MB
+DOCUMENT_UPLOAD_LIMIT = int(os.getenv('DOCUMENT_UPLOAD_LIMIT_MB', '25')) * MB
+IMAGE_UPLOAD_LIMIT = int(os.getenv('IMAGE_UPLOAD_LIMIT_MB', '10')) * MB
+
+# Configure Gemini AI (.env was loaded above)
 GOOGLE_AI_API_KEY = os.getenv("GOOGLE_AI_API_KEY")
 
-if not GOOGLE_AI_API_KEY:
+if not GOOGLE_AI_API_KEY and llm.requires_api_key():
     raise ValueError("GOOGLE_AI_API_KEY is not set in the .env file")
 
-genai.configure(api_key=GOOGLE_AI_API_KEY)
+llm.configure(GOOGLE_AI_API_KEY)
 
 # Configure Gemini model parameters
 generation_config = {
@@ -54,11 +73,8 @@ generation_config = {
     "max_output_tokens": 300,
 }
 
-# Initialize Gemini model
-scene_model = genai.GenerativeModel(
-    "gemini-1.5-flash",
-    generation_config=generation_config
-)
+# Shared Gemini model handle
+scene_model = llm.get_model("gemini-1.5-flash", generation_config)
 
 # Split allowed extensions by file type
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
@@ -73,59 +89,37 @@ def allowed_document_file(filename):
 def allowed_ppt_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in PPT_ALLOWED_EXTENSIONS
 
-class MCQGenerator:
-    def __init__(self):
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
-    
-    def generate_mcq_for_chapter(self, chapter_name):
-        prompt = f"""Generate 10 multiple-choice questions (2 questions each from 5 important topics) 
-        for the chapter: {chapter_name}. 
-        Strictly follow this JSON format:
-        [
-            {{
-                "question": "Question text",
-                "options": ["Option A", "Option B", "Option C", "Option D"],
-                "correct_answer": "A or B or C or D"
-            }},
-            ...
-        ]
-        Ensure:
-        - Questions cover different aspects of {chapter_name}
-        - Options are plausible
-        - Correct answer is clearly marked
-        """
-        response = self.model.generate_content(prompt)
-        questions_data = self.extract_json_from_text(response.text)
-        
-        if not questions_data:
-            raise ValueError(f"Could not parse questions. Response: {response.text}")
-        
-        full_mcqs = []
-        for i, q in enumerate(questions_data, 1):
-            full_mcq = {
-                "question_number": i,
-                "question": q['question'],
-                "options": q['options'],
-                "correct_answer_option": q['correct_answer']
-            }
-            full_mcqs.append(full_mcq)
-        
-        return full_mcqs
+def wants_stream():
+    """Clients opt into NDJSON streaming with ?stream=1 or Accept: application/x-ndjson."""
+    return (request.args.get('stream', '').lower() in ('1', 'true')
+            or 'application/x-ndjson' in request.headers.get('Accept', ''))
 
-    def extract_json_from_text(self, text):
-        text = text.replace('json', '').strip()
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            json_match = re.search(r'\[.*\]', text, re.DOTALL | re.MULTILINE | re.UNICODE)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(0))
-                except json.JSONDecodeError:
-                    pass
-        return None
+def ndjson_response(lines):
+    """Stream an iterable of JSON-serialisable objects, one per line, unbuffered."""
+    return Response(
+        (json.dumps(line) + "\n" for line in lines),
+        mimetype='application/x-ndjson',
+        headers={
+            'X-Accel-Buffering': 'no',
+            'Cache-Control': 'no-cache',
+            'Connection': 'keep-alive'
+        }
+    )
+
+def stream_sentences(sentences, key, **extra):
+    """NDJSON lines for a sentence stream: one per sentence, then the full text under `key`."""
+    parts = []
+    try:
+        for sentence in sentences:
+            parts.append(sentence)
+            yield {'type': 'sentence', 'text': sentence}
+        yield {'type': 'done', key: ' '.join(parts), **extra}
+    except Exception as e:
+        logger.error(f"Error streaming {key}: {e}")
+        yield {'type': 'error', 'error': str(e)}
 
 @app.route('/api/scene-description', methods=['POST'])
+@uploads.limit_upload(IMAGE_UPLOAD_LIMIT)
 def scene_description():
     if 'image' not in request.files:
         return jsonify({"error": "No image file uploaded"}), 400
@@ -158,7 +152,7 @@ def scene_description():
             image_part
         ]
 
-        response = scene_model.generate_content(prompt_parts)
+        response = scene_model.generate_content(prompt_parts, site="scene_description")
         
         if not response.text:
             return jsonify({"error": "Could not generate description"}), 500
@@ -191,7 +185,7 @@ def scene_description():
             try:
                 os.remove(image_path)
             except Exception as e:
-                print(f"Error removing temporary file: {e}")
+                logger.warning(f"Error removing temporary file: {e}")
 
 @app.route('/api/ask_more', methods=['POST'])
 def handle_ask_more():
@@ -202,14 +196,40 @@ def handle_ask_more():
     previous_query = data.get('previous_query')
     previous_response = data.get('previous_response')
     current_query = data.get('query')
-    print(data)
+    # Clients keep the id returned by their first call and send it back
+    session_id = data.get('session_id') or request.headers.get('X-Session-Id') or conversations.new_session_id()
+    logger.debug(f"ask_more request: {data}")
+
+    if wants_stream():
+        return ndjson_response(stream_sentences(
+            ask_mor_stream(previous_query, previous_response, current_query, session_id),
+            'info', session_id=session_id))
     
-    response = ask_mor(previous_query, previous_response, current_query)
+    response = ask_mor(previous_query, previous_response, current_query, session_id)
+    response['session_id'] = session_id
     return jsonify(response)
 
+@app.route('/api/topic-cache/warm-up', methods=['POST'])
+def topic_cache_warm_up():
+    """Start pre-generating explanations for the most requested topics in the background (see Topic/explanations.py)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        top = int(data.get('top', 50))
+        days = float(data.get('days', 30))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top and days must be numbers'}), 400
+    if not 1 <= top <= TOPIC_WARM_UP_MAX_TOP:
+        return jsonify({'error': f'top must be between 1 and {TOPIC_WARM_UP_MAX_TOP}'}), 400
+    if days < 0:
+        return jsonify({'error': 'days must not be negative'}), 400
+    _, started = schedule_warm_up(top, days)
+    return jsonify({'status': 'started' if started else 'already_running'}), 202
+
 @app.route('/api/get_response', methods=['POST'])
 def handle_get_response():
     data = request.json
+    if wants_stream():
+        return ndjson_response(stream_sentences(get_response_stream(data['topic']), 'response'))
     response = get_response(data['topic'])
     return jsonify({'response': response})
 
@@ -230,13 +250,16 @@ def process_sign(sign, caption):
 
     try:
         if isinstance(sign, slt.Video):
-            try:
-                sign.save(temp_path, overwrite=True)
-            except TypeError:
-                sign.save(temp_path)
+            # Writing the clip is where the frames are actually synthesised and encoded
+            with tracing.span("sign.encode"):
+                try:
+                    sign.save(temp_path, overwrite=True)
+                except TypeError:
+                    sign.save(temp_path)
 
-            with open(temp_path, "rb") as video_file:
-                video_base64 = base64.b64encode(video_file.read()).decode("utf-8")
+            with tracing.span("sign.base64"):
+                with open(temp_path, "rb") as video_file:
+                    video_base64 = base64.b64encode(video_file.read()).decode("utf-8")
 
             return json.dumps({
                 "type": "video",
@@ -263,13 +286,14 @@ def translate_to_sign_api():
     def generate_signs():
         try:
             # Now returns (sign, caption) tuples
-            signs_with_captions = fail_safe_translate(model, text)
+            with tracing.span("sign.synthesis"):
+                signs_with_captions = fail_safe_translate(model, text)
             
             for sign, caption in signs_with_captions:
                 try:
                     yield process_sign(sign, caption)
                 except Exception as e:
-                    print(f"Error processing sign: {e}")
+                    logger.error(f"Error processing sign: {e}")
                     yield json.dumps({
                         "type": "text",
                         "data": f"Error with sign: {e}",
@@ -278,7 +302,7 @@ def translate_to_sign_api():
 
         except Exception as e:
             error_msg = f"Translation error: {str(e)}"
-            print(error_msg)
+            logger.error(error_msg)
             yield json.dumps({
                 "type": "text",
                 "data": error_msg
@@ -296,6 +320,7 @@ def translate_to_sign_api():
 
 # Add TalkToPDF routes
 @app.route('/api/upload_document', methods=['POST'])
+@uploads.limit_upload(DOCUMENT_UPLOAD_LIMIT)
 def upload_document():
     try:
         if 'file' not in request.files:
@@ -308,7 +333,7 @@ def upload_document():
         if file and allowed_document_file(file.filename):
             filename = secure_filename(file.filename)
             file_path = os.path.join(app.config['DOCUMENT_UPLOAD_FOLDER'], filename)
-            file.save(file_path)
+            uploads.save_upload(file, file_path)
             
             try:
                 rag_system = RAGSystem(pdf_path=file_path, api_key=GOOGLE_AI_API_KEY)
@@ -394,6 +419,21 @@ def summarize():
             "message": str(e)
         }), 500
 
+def stream_mcqs(chapter_name):
+    """NDJSON lines for a quiz: one per question as soon as it is ready, then a summary."""
+    count = 0
+    try:
+        source, questions = mcq.stream_quiz(chapter_name)
+        for question in questions:
+            count += 1
+            yield {'type': 'question', 'question': question}
+        if not count:
+            raise ValueError(f"Could not generate questions for chapter: {chapter_name}")
+        yield {'type': 'done', 'count': count, 'source': source}
+    except Exception as e:
+        logger.error(f"Error streaming MCQs: {e}")
+        yield {'type': 'error', 'error': str(e)}
+
 @app.route('/api/generate-mcq', methods=['POST'])
 def generate_mcq():
     if request.method == 'POST':
@@ -406,13 +446,16 @@ def generate_mcq():
         if not chapter_name:
             return jsonify({'error': 'Chapter name is required'}), 400
         
-        generator = MCQGenerator()
-        
+        if wants_stream():
+            return ndjson_response(stream_mcqs(chapter_name))
+
         try:
-            mcqs = generator.generate_mcq_for_chapter(chapter_name)
+            # Drawn from the question bank when it has enough for this chapter
+            mcqs, source = mcq.get_quiz(chapter_name)
             return jsonify({
                 'message': 'MCQs generated successfully', 
-                'answer_key': mcqs
+                'answer_key': mcqs,
+                'source': source
             })
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -420,6 +463,7 @@ def generate_mcq():
     return jsonify({'error': 'Invalid request method'}), 405
 
 @app.route('/api/upload-ppt', methods=['POST'])
+@uploads.limit_upload(PPT_UPLOAD_LIMIT)
 def upload_ppt():
     try:
         if 'file' not in request.files:
@@ -433,11 +477,16 @@ def upload_ppt():
             return jsonify({'error': 'Invalid file type'}), 400
 
         filename = secure_filename(file.filename)
-        ppt_path = os.path.join(PPT_UPLOAD_FOLDER, filename)
-        file.save(ppt_path)
-        
+        # Unique per upload so concurrent uploads of same-named decks don't collide
+        ppt_path = os.path.join(PPT_UPLOAD_FOLDER, f"{uuid.uuid4().hex}_{filename}")
+        # Hashed while it streams to disk, so the pipeline need not re-read it
+        deck_hash, _ = uploads.save_upload(file, ppt_path)
+
+        if wants_stream():
+            return ndjson_response(stream_ppt_slides(ppt_path, filename, deck_hash))
+
         # Process the PPT and generate slides data
-        slides_data = generate_scripts(ppt_path)
+        slides_data = generate_scripts(ppt_path, filename, deck_hash=deck_hash)
         
         # Cleanup
         if os.path.exists(ppt_path):
@@ -448,11 +497,89 @@ def upload_ppt():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def stream_ppt_slides(ppt_path, filename, deck_hash=None):
+    """
+    Emit each slide as soon as its image, script and audio are ready, in
+    completion order (clients place them by slide_no), then a final "done"
+    carrying per-stage throughput and cache hit/miss counts.
+    """
+    count = 0
+    stats = PipelineStats()
+    try:
+        for slide in iter_slides(ppt_path, filename, stats, deck_hash=deck_hash):
+            count += 1
+            yield {'type': 'slide', **slide}
+        yield {'type': 'done', 'total': count, 'stats': stats.summary()}
+    except Exception as e:
+        logger.error(f"Error streaming PPT slides: {e}")
+        yield {'type': 'error', 'error': f"Error processing PPT: {str(e)}"}
+    finally:
+        if os.path.exists(ppt_path):
+            os.remove(ppt_path)
+
+@app.route('/api/ppt-video', methods=['POST'])
+@uploads.limit_upload(PPT_UPLOAD_LIMIT)
+def create_ppt_video():
+    """
+    Render a deck to MP4 in the background. Optional form field `scripts` is a
+    JSON list with one entry per slide; non-empty entries replace the generated
+    narration. Poll the returned status_url for progress.
+    """
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file part'}), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No selected file'}), 400
+
+        if not allowed_ppt_file(file.filename):
+            return jsonify({'error': 'Invalid file type'}), 400
+
+        scripts = None
+        if request.form.get('scripts'):
+            try:
+                scripts = json.loads(request.form['scripts'])
+            except ValueError:
+                return jsonify({'error': 'scripts must be a JSON list'}), 400
+            if not isinstance(scripts, list):
+                return jsonify({'error': 'scripts must be a JSON list'}), 400
+
+        filename = secure_filename(file.filename)
+        ppt_path = os.path.join(PPT_UPLOAD_FOLDER, f"{uuid.uuid4().hex}_{filename}")
+        deck_hash, _ = uploads.save_upload(file, ppt_path)
+
+        job = ppt_video.submit(ppt_path, filename, scripts, deck_hash)
+        data = job.to_dict()
+        data['status_url'] = f"/api/ppt-video/{job.job_id}"
+        return jsonify(data), 200 if data['status'] == 'done' else 202
+
+    except Exception as e:
+        logger.error(f"Error starting video render: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ppt-video/<job_id>', methods=['GET'])
+def ppt_video_status(job_id):
+    job = ppt_video.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/download/<filename>', methods=['GET'])
+def download_video(filename):
+    return send_from_directory(os.path.abspath(ppt_storage.VIDEO_FOLDER), filename, as_attachment=True)
+
 @app.route('/api/youtube-braille/', methods=['GET'])
 def translate_to_braille():
     video_url = request.args.get('url')
     if not video_url:
         return jsonify({"error": "No URL provided"}), 400
+    grade = request.args.get('grade', type=int)
+    if grade not in (None, 1, 2):
+        return jsonify({"error": "grade must be 1 or 2"}), 400
+    language = request.args.get('lang', DEFAULT_LANGUAGE)
+    if not LANGUAGE_CODE.fullmatch(language):
+        return jsonify({"error": "Invalid language code"}), 400
     
     translator = YouTubeBrailleTranslator()
     video_id = translator.extract_video_id(video_url)
@@ -460,7 +587,7 @@ def translate_to_braille():
     if not video_id:
         return jsonify({"error": "Invalid YouTube URL"}), 400
     
-    braille_text = translator.translate_transcript_to_braille(video_id)
+    braille_text = translator.translate_transcript_to_braille(video_id, grade, language)
     
     if not braille_text:
         return jsonify({"error": "Braille translation failed"}), 500
@@ -470,5 +597,15 @@ def translate_to_braille():
         "success": True
     })
 
+@app.route('/api/youtube-braille/cache-stats', methods=['GET'])
+def youtube_braille_cache_stats():
+    """Transcript cache lookups by tier, shared and failed fetches, and entry counts."""
+    return jsonify(youtube_transcripts.stats())
+
+@app.route('/api/llm-stats', methods=['GET'])
+def llm_stats():
+    """Per call site Gemini call counts, errors, retries, latency and token usage."""
+    return jsonify(llm.stats())
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
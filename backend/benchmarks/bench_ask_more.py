@@ -0,0 +1,87 @@
+"""
+Per-turn latency of the Topic ask_more flow.
+
+"two-call" replays the previous flow: summarise the context, then answer, both
+on the user's critical path. "single-call" is the current ask_mor, which
+answers straight from the stored summary and refreshes it in the background
+every TOPIC_SUMMARY_EVERY_TURNS turns. Both run the same number of sessions
+and turns against the fake LLM; the report is per-turn p50/p95 and the number
+of LLM calls per turn (including the background ones).
+
+Usage (from backend/):
+    python benchmarks/bench_ask_more.py --sessions 8 --turns 6 --llm-latency 1.0
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+TOPIC_SITES = ("topic_context", "topic_ask_more")
+
+
+def two_call_turn(topic, summary, user, ai, query):
+    """The previous ask_mor: a blocking summary call followed by the answer call."""
+    context = topic.model.generate_content(
+        f"Based on the previous chat history:\ncontext : {summary}\nUser: {user}\nAI: {ai}\n"
+        f"current query : {query}\nSummarize this interaction in 2-3 lines.",
+        site="topic_context").text.strip()
+    answer = topic.model.generate_content(
+        f"Context: {context}\nnew user Query: {query}\nProvide a brief, friendly, and clear response.",
+        site="topic_ask_more").text.strip()
+    return context, answer
+
+
+def run_session(topic, mode, session_no, turns):
+    latencies = []
+    user, ai, summary = "photosynthesis", "Plants turn light into food.", ""
+    for turn in range(turns):
+        query = f"follow-up question {turn} of session {session_no}"
+        start = time.perf_counter()
+        if mode == "two-call":
+            summary, answer = two_call_turn(topic, summary, user, ai, query)
+        else:
+            answer = topic.ask_mor(user, ai, query, f"bench-{session_no}")["info"]
+        latencies.append(time.perf_counter() - start)
+        user, ai = query, answer
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-call and single-call ask_more latency")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--llm-latency", type=float, default=1.0,
+                        help="seconds to first token for the fake LLM")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+
+    from Common import llm
+    from Topic import LlmResponse as topic
+
+    print(f"{args.sessions} sessions x {args.turns} turns, summary every {topic.SUMMARY_EVERY_TURNS} turns")
+    print(f"{'mode':>12} {'p50 s':>7} {'p95 s':>7} {'calls/turn':>11}")
+    for mode in ("two-call", "single-call"):
+        before = llm.stats()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            results = pool.map(run_session, [topic] * args.sessions, [mode] * args.sessions,
+                               range(args.sessions), [args.turns] * args.sessions)
+            latencies = [latency for session in results for latency in session]
+        topic.wait_for_summaries()
+        after = llm.stats()
+        calls = sum(after.get(site, {}).get("calls", 0) - before.get(site, {}).get("calls", 0)
+                    for site in TOPIC_SITES)
+        print(f"{mode:>12} {fixtures.percentile(latencies, 50):>7.2f} "
+              f"{fixtures.percentile(latencies, 95):>7.2f} "
+              f"{calls / len(latencies):>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
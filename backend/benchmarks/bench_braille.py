@@ -0,0 +1,106 @@
+"""
+Braille translation throughput on hour-long transcripts.
+
+"legacy" is the previous BrailleConverter.to_braille (per-character dict
+lookups; digits, capitals and most punctuation became blanks). "grade 1" and
+"grade 2" are YoutubeBraille.braille.translate; grade 2 is measured cold (empty
+word cache) and warm (the same transcript translated again). A transcript is
+--minutes of speech at 150 words a minute, with capitals, numbers and
+punctuation, split into caption lines like youtube_transcript_api returns.
+
+Usage (from backend/):
+    python benchmarks/bench_braille.py --minutes 60 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+COMMON_WORDS = ("the", "and", "of", "to", "in", "it", "is", "that", "this", "with", "for", "you", "we",
+                "there", "which", "about", "through", "question", "people", "knowledge", "children",
+                "thinking", "everything", "father", "mother", "world", "should", "would", "could",
+                "being", "string", "another", "because", "something", "important", "understand")
+WORDS_PER_MINUTE = 150
+WORDS_PER_LINE = 8
+
+LEGACY_MAP = {
+    'a': '⠁', 'b': '⠃', 'c': '⠉', 'd': '⠙', 'e': '⠑', 'f': '⠋', 'g': '⠛', 'h': '⠓', 'i': '⠊', 'j': '⠚',
+    'k': '⠅', 'l': '⠇', 'm': '⠍', 'n': '⠝', 'o': '⠕', 'p': '⠏', 'q': '⠟', 'r': '⠗', 's': '⠎', 't': '⠞',
+    'u': '⠥', 'v': '⠧', 'w': '⠺', 'x': '⠭', 'y': '⠽', 'z': '⠵',
+    ' ': '⠀', '.': '⠲', ',': '⠂', '!': '⠖',
+}
+
+
+def legacy_to_braille(text):
+    """The previous BrailleConverter.to_braille, kept for the comparison."""
+    return ''.join([LEGACY_MAP.get(char.lower(), '⠀') for char in text])
+
+
+def make_transcript(minutes, seed=0):
+    rng = random.Random(seed)
+    vocabulary = COMMON_WORDS + fixtures.WORDS
+    words = []
+    for i in range(minutes * WORDS_PER_MINUTE):
+        roll = rng.random()
+        if roll < 0.03:
+            word = str(rng.randint(1, 2025))
+        elif roll < 0.06:
+            word = rng.choice(vocabulary).upper()
+        elif roll < 0.15:
+            word = rng.choice(vocabulary).capitalize()
+        else:
+            word = rng.choice(vocabulary)
+        if rng.random() < 0.08:
+            word += rng.choice(".,?!")
+        words.append(word)
+    return [{"text": " ".join(words[i:i + WORDS_PER_LINE])} for i in range(0, len(words), WORDS_PER_LINE)]
+
+
+def measure(translate, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        translate(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Braille translation throughput")
+    parser.add_argument("--minutes", type=int, default=60, help="transcript length in minutes of speech")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from YoutubeBraille import braille
+
+    transcript = make_transcript(args.minutes)
+    text = "\n".join(line["text"] for line in transcript)
+
+    braille.contract.cache_clear()
+    start = time.perf_counter()
+    braille.translate(text, grade=2)
+    grade2_cold = time.perf_counter() - start
+
+    results = [
+        # The previous code translated every caption line separately
+        ("legacy", measure(lambda _: "\n".join(legacy_to_braille(line["text"]) for line in transcript),
+                           text, args.repeat)),
+        ("grade 1", measure(lambda t: braille.translate(t, grade=1), text, args.repeat)),
+        ("grade 2 cold", grade2_cold),
+        ("grade 2 warm", measure(lambda t: braille.translate(t, grade=2), text, args.repeat)),
+    ]
+
+    print(f"{args.minutes} min transcript: {len(transcript)} lines, {len(text):,} characters")
+    print(f"{'engine':>13} {'seconds':>9} {'chars/s':>13}")
+    for name, seconds in results:
+        print(f"{name:>13} {seconds:>9.4f} {len(text) / seconds:>13,.0f}")
+
+
+if __name__ == '__main__':
+    main()
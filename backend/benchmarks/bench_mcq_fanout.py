@@ -0,0 +1,121 @@
+"""
+Single-call vs per-topic fan-out MCQ generation.
+
+"single-call" replays the previous generator: one request for all 10 questions,
+repeated whole until it parses. "fan-out" is MCQGenerator.generate_questions:
+a topic-list request, then one parallel request per topic with retries only for
+the topics whose answer was bad. "fan-out" runs cold chapters, so it includes
+the topic-list request; "fan-out warm" repeats the same chapters with their
+topic lists cached, which is the steady state for bank top-ups.
+--malformed-rate truncates that fraction of LLM answers to exercise the retry
+paths. The report is per-quiz p50/p95 wall time and LLM calls per quiz.
+
+Usage (from backend/):
+    python benchmarks/bench_mcq_fanout.py --chapters 20 --llm-latency 1.0 --malformed-rate 0.2
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+MCQ_SITES = ("mcq", "mcq_topics", "mcq_topic")
+SINGLE_CALL_ATTEMPTS = 3
+
+
+def break_some_answers(provider, rate, seed=0):
+    """Truncate `rate` of the fake provider's MCQ answers mid-JSON."""
+    chaos = random.Random(seed)
+    for site in MCQ_SITES:
+        responder = provider.responders[site]
+
+        def flaky(prompt, rng, output_tokens, responder=responder):
+            text = responder(prompt, rng, output_tokens)
+            return text[:len(text) // 2] if chaos.random() < rate else text
+
+        provider.register_responder(site, flaky)
+
+
+def legacy_extract(text):
+    """The previous extract_json_from_text, kept for the comparison."""
+    text = text.replace('json', '').strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\[.*\]', text, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group(0))
+            except json.JSONDecodeError:
+                pass
+    return None
+
+
+def single_call_quiz(generator, chapter):
+    """The previous generate_mcq_for_chapter: all 10 questions in one request."""
+    prompt = f"""Generate 10 multiple-choice questions (2 questions each from 5 important topics)
+    for the chapter: {chapter}.
+    Strictly follow this JSON format:
+    [{{"question": "Question text", "options": ["A", "B", "C", "D"], "correct_answer": "A"}}]
+    """
+    for _ in range(SINGLE_CALL_ATTEMPTS):
+        questions = legacy_extract(generator.model.generate_content(prompt, site="mcq").text)
+        if questions:
+            return questions
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-call and fan-out MCQ generation")
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=1.0,
+                        help="seconds to first token for the fake LLM")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="fraction of LLM answers truncated into invalid JSON")
+    parser.add_argument("--seed", type=int, default=1, help="seed for which answers get truncated")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+    os.chdir(tempfile.mkdtemp(prefix="mcq-bench-"))
+
+    from Common import llm
+    from MCQ_generator.generator import generator
+
+    break_some_answers(llm.get_provider(), args.malformed_rate, args.seed)
+
+    print(f"{args.chapters} chapters, {args.malformed_rate:.0%} malformed answers")
+    print(f"{'mode':>13} {'p50 s':>7} {'p95 s':>7} {'calls/quiz':>11} {'questions':>10}")
+    for mode in ("single-call", "fan-out", "fan-out warm"):
+        before = llm.stats()
+        latencies, questions = [], 0
+        for chapter_no in range(args.chapters):
+            chapter = f"chapter {chapter_no}"
+            start = time.perf_counter()
+            if mode == "single-call":
+                quiz = single_call_quiz(generator, chapter)
+            else:
+                try:
+                    quiz = generator.generate_questions(chapter)
+                except ValueError:
+                    quiz = []
+            latencies.append(time.perf_counter() - start)
+            questions += len(quiz)
+        after = llm.stats()
+        calls = sum(after.get(site, {}).get("calls", 0) - before.get(site, {}).get("calls", 0)
+                    for site in MCQ_SITES)
+        print(f"{mode:>13} {fixtures.percentile(latencies, 50):>7.2f} "
+              f"{fixtures.percentile(latencies, 95):>7.2f} "
+              f"{calls / args.chapters:>11.2f} {questions / args.chapters:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
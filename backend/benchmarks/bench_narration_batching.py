@@ -0,0 +1,72 @@
+"""
+Per-slide vs batched narration for PPT decks.
+
+Runs generate_scripts on the same synthetic deck once per batch size, each time
+with empty caches and storage, and reports wall time, number of LLM requests
+and prompt / output tokens. Uses the fake LLM provider by default, whose first
+token latency stands in for the Gemini round trip; pass --provider gemini to
+measure the real thing.
+
+Usage (from backend/):
+    python benchmarks/bench_narration_batching.py --slides 40 --batch-sizes 1,5,10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+NARRATION_SITES = ("ppt_script", "ppt_script_batch")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-slide and batched slide narration")
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--batch-sizes", default="1,5,10")
+    parser.add_argument("--provider", default="fake")
+    parser.add_argument("--llm-latency", type=float, default=1.0,
+                        help="seconds to first token for the fake LLM")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = args.provider
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+    os.chdir(tempfile.mkdtemp(prefix="narration-bench-"))
+
+    from Common import llm, tts
+    from Common.store import KeyValueStore
+    import PPTtoVideo.PPT_Script as ppt_script
+
+    # Only narration is being measured; skip real TTS
+    tts.set_engine("silent")
+
+    deck_path = os.path.abspath("deck.pptx")
+    with open(deck_path, "wb") as deck_file:
+        deck_file.write(fixtures.make_pptx(args.slides))
+
+    print(f"{'batch':>6} {'wall s':>8} {'requests':>9} {'prompt tok':>11} {'output tok':>11}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        # Fresh storage and narration cache so every run starts cold
+        os.chdir(tempfile.mkdtemp(prefix=f"batch-{batch_size}-"))
+        ppt_script.narration_cache = KeyValueStore("slide_narrations", path=os.path.abspath("store.sqlite3"))
+        before = llm.stats()
+
+        start = time.perf_counter()
+        ppt_script.generate_scripts(deck_path, batch_size=batch_size)
+        wall = time.perf_counter() - start
+
+        after = llm.stats()
+        totals = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+        for site in NARRATION_SITES:
+            for key in totals:
+                totals[key] += after.get(site, {}).get(key, 0) - before.get(site, {}).get(key, 0)
+        print(f"{batch_size:>6} {wall:>8.2f} {totals['calls']:>9} "
+              f"{totals['prompt_tokens']:>11} {totals['output_tokens']:>11}")
+
+
+if __name__ == '__main__':
+    main()
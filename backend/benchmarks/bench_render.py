@@ -0,0 +1,113 @@
+"""
+Slide rasteriser throughput: the previous renderer vs PPTtoVideo.render.
+
+The previous renderer (kept below as `legacy_slide_to_image`) reloaded fonts
+for every slide and re-measured the whole growing line after each word, which
+is quadratic in paragraph length. Both renderers draw the same synthetic deck;
+the report is slides/second and ms/slide for each.
+
+Usage (from backend/):
+    python benchmarks/bench_render.py --slides 30 --paragraphs 12
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+
+def legacy_slide_to_image(slide, image_path):
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = 1920, 1080
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    try:
+        font_large = ImageFont.truetype("arial.ttf", 60)
+        font_normal = ImageFont.truetype("arial.ttf", 40)
+    except OSError:
+        font_large = ImageFont.load_default()
+        font_normal = ImageFont.load_default()
+
+    title_text = ""
+    body_texts = []
+    for shape in slide.shapes:
+        if not hasattr(shape, "text"):
+            continue
+        if shape.top < height * 0.2 and not title_text:
+            title_text = shape.text.strip()
+        elif shape.text.strip():
+            body_texts.append(shape.text.strip())
+
+    if title_text:
+        bbox = draw.textbbox((0, 0), title_text, font=font_large)
+        draw.text(((width - (bbox[2] - bbox[0])) // 2, 50), title_text, font=font_large, fill='black')
+
+    y_position = 200
+    for text in body_texts:
+        lines = []
+        current_line = []
+        for word in text.split():
+            current_line.append(word)
+            bbox = draw.textbbox((0, 0), ' '.join(current_line), font=font_normal)
+            if bbox[2] - bbox[0] > width - 100:
+                lines.append(' '.join(current_line[:-1]))
+                current_line = [word]
+        if current_line:
+            lines.append(' '.join(current_line))
+        for line in lines:
+            bbox = draw.textbbox((0, 0), line, font=font_normal)
+            draw.text(((width - (bbox[2] - bbox[0])) // 2, y_position), line, font=font_normal, fill='black')
+            y_position += 60
+        y_position += 40
+
+    image.save(image_path, 'PNG')
+
+
+def measure(render, slides, out_dir, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index, slide in enumerate(slides):
+            render(slide, os.path.join(out_dir, f"{index}.png"))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare slide rasteriser throughput")
+    parser.add_argument("--slides", type=int, default=30)
+    parser.add_argument("--paragraphs", type=int, default=12,
+                        help="body paragraphs per slide (text-heavy decks stress wrapping)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per renderer; the best is reported")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="render-bench-"))
+
+    from pptx import Presentation
+    from PPTtoVideo.render import slide_to_image
+
+    deck = Presentation(io.BytesIO(fixtures.make_pptx(args.slides, paragraphs_per_slide=args.paragraphs)))
+    slides = list(deck.slides)
+    out_dir = os.path.abspath("out")
+    os.makedirs(out_dir)
+
+    print(f"{args.slides} slides, {args.paragraphs} paragraphs each")
+    print(f"{'renderer':>10} {'total s':>9} {'ms/slide':>9} {'slides/s':>9}")
+    results = {}
+    for name, render in (("legacy", legacy_slide_to_image), ("current", slide_to_image)):
+        elapsed = measure(render, slides, out_dir, args.repeat)
+        results[name] = elapsed
+        print(f"{name:>10} {elapsed:>9.2f} {elapsed / len(slides) * 1000:>9.1f} {len(slides) / elapsed:>9.1f}")
+    print(f"speedup: {results['legacy'] / results['current']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Voiceover latency per TTS engine (Common/tts.py).
+
+Synthesises the same set of slide-length narrations with each engine, first one
+at a time (per-slide latency p50/p95) and then with --concurrency threads the
+way the PPT pipeline's voice pool does (wall time for the whole deck). Engines
+that cannot start here (no network for gtts, no espeak-ng / ffmpeg on PATH) are
+reported and skipped.
+
+Usage (from backend/):
+    python benchmarks/bench_tts.py --engines gtts,espeak --slides 20 --concurrency 8
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+
+
+def timed_synthesis(engine, text, path):
+    start = time.perf_counter()
+    engine.synthesize(text, path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TTS engine latency on slide narrations")
+    parser.add_argument("--engines", default="gtts,espeak")
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    from Common import tts
+
+    rng = random.Random(0)
+    # Roughly the length of a 15 second narration
+    texts = [fixtures.paragraph(rng, 3) for _ in range(args.slides)]
+    out_dir = tempfile.mkdtemp(prefix="tts-bench-")
+
+    print(f"{args.slides} narrations, concurrency {args.concurrency}")
+    print(f"{'engine':>8} {'p50 ms':>9} {'p95 ms':>9} {'serial s':>9} {'parallel s':>11} {'avg KB':>8}")
+    for name in args.engines.split(","):
+        try:
+            engine = tts.create_engine(name)
+            paths = [os.path.join(out_dir, f"{name}-{i}.{engine.extension}") for i in range(len(texts))]
+            serial = [timed_synthesis(engine, text, path) for text, path in zip(texts, paths)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                list(pool.map(engine.synthesize, texts, paths))
+            parallel = time.perf_counter() - start
+        except Exception as e:
+            print(f"{name:>8} skipped: {e}")
+            continue
+        size_kb = statistics.mean(os.path.getsize(path) for path in paths) / 1024
+        print(f"{name:>8} {fixtures.percentile(serial, 50) * 1000:>9.0f} "
+              f"{fixtures.percentile(serial, 95) * 1000:>9.0f} "
+              f"{sum(serial):>9.2f} {parallel:>11.2f} {size_kb:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Synthetic inputs for the benchmark suite.
+
+Everything is generated on the fly and seeded, so runs are repeatable and no
+sample documents need to live in the repository.
+"""
+import io
+import random
+
+WORDS = ("energy", "current", "voltage", "circuit", "resistance", "charge", "battery",
+         "conductor", "insulator", "magnet", "field", "power", "heat", "light", "wire",
+         "switch", "series", "parallel", "electron", "ohm", "law", "measure", "flow")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0-100) of the values; 0.0 for none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def paragraph(rng: random.Random, sentences: int = 5, words: int = 14) -> str:
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+
+def make_pdf(pages: int = 10, seed: int = 0) -> bytes:
+    """A minimal, valid text PDF that PyPDF2 can extract from."""
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = len(objects) + 1
+    objects.append(None)  # placeholder for the page tree
+    page_ids = []
+    for _ in range(pages):
+        lines = [paragraph(rng, 1) for _ in range(30)]
+        stream = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(
+            "(" + line.replace("(", "").replace(")", "") + ") '" for line in lines
+        ) + " ET"
+        stream_bytes = stream.encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream_bytes) + stream_bytes + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode("ascii")
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+              % (len(objects) + 1, catalog_id, xref))
+    return out.getvalue()
+
+
+def make_pptx(slides: int = 10, seed: int = 0, paragraphs_per_slide: int = 2) -> bytes:
+    """A title-and-content deck with seeded text on every slide."""
+    from pptx import Presentation
+
+    rng = random.Random(seed)
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for index in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {index + 1}: {rng.choice(WORDS).capitalize()}"
+        body = slide.placeholders[1].text_frame
+        body.text = paragraph(rng, 3)
+        for _ in range(paragraphs_per_slide - 1):
+            body.add_paragraph().text = paragraph(rng, 3)
+    out = io.BytesIO()
+    prs.save(out)
+    return out.getvalue()
+
+
+def make_png(width: int = 640, height: int = 480, seed: int = 0) -> bytes:
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.rectangle((x, y, x + rng.randrange(20, 120), y + rng.randrange(20, 120)),
+                       fill=tuple(rng.randrange(256) for _ in range(3)))
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+def make_transcript(minutes: int = 60, seed: int = 0):
+    """Entries shaped like YouTubeTranscriptApi.get_transcript output, ~1 per 4 seconds."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(minutes * 15):
+        entries.append({
+            "text": paragraph(rng, 1, rng.randrange(6, 14)),
+            "start": i * 4.0,
+            "duration": 4.0,
+        })
+    return entries
@@ -0,0 +1,105 @@
+"""
+Concurrent HTTP load generator for comparing serving modes.
+
+Start the backend twice, once per mode, then point the load test at both:
+
+    SERVER_MODE=sync  PORT=5000 python serve.py
+    SERVER_MODE=async PORT=5001 python serve.py
+
+    python benchmarks/load_test.py --path /api/get_response --json '{"topic": "Photosynthesis"}' \
+        --target sync=http://127.0.0.1:5000 --target async=http://127.0.0.1:5001 \
+        --concurrency 200 --requests 1000
+
+Every request hits the real endpoint. Start both servers with LLM_PROVIDER=fake
+(see Common/llm_providers.py) to compare serving modes without spending quota.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import fixtures
+
+
+def send_request(url, method, body, timeout):
+    data = body.encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            ok = 200 <= response.status < 300
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_load(base_url, path, method, body, concurrency, total, timeout):
+    url = base_url.rstrip("/") + path
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(_):
+        nonlocal errors
+        elapsed, ok = send_request(url, method, body, timeout)
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(total)))
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "p50_ms": round(fixtures.percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(fixtures.percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(fixtures.percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare throughput of backend serving modes")
+    parser.add_argument("--target", action="append", required=True,
+                        help="name=base_url, e.g. async=http://127.0.0.1:5001 (repeatable)")
+    parser.add_argument("--path", default="/api/get_response")
+    parser.add_argument("--method", default="POST")
+    parser.add_argument("--json", dest="body", default='{"topic": "Photosynthesis"}')
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    body = args.body if args.method.upper() != "GET" else None
+    results = {}
+    for target in args.target:
+        name, _, base_url = target.partition("=")
+        print(f"Running {args.requests} requests against {name} ({base_url}) "
+              f"with concurrency {args.concurrency}...")
+        results[name] = run_load(base_url, args.path, args.method.upper(), body,
+                                 args.concurrency, args.requests, args.timeout)
+        print(json.dumps(results[name], indent=4))
+
+    if len(results) > 1:
+        baseline_name = next(iter(results))
+        baseline = results[baseline_name]["throughput_rps"] or 1.0
+        for name, result in results.items():
+            print(f"{name}: {result['throughput_rps']} req/s "
+                  f"({result['throughput_rps'] / baseline:.2f}x {baseline_name})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+End-to-end benchmark suite for the unified backend (app.py).
+
+Drives every heavy endpoint in-process through Flask's test client with
+synthetic fixtures (see fixtures.py) and the offline fake LLM provider, then
+reports p50/p95/p99 latency, throughput and peak RSS per scenario. Network-bound
+dependencies that are not LLM calls (YouTube transcripts, gTTS) are swapped for
+local stand-ins so the numbers measure our own overhead.
+
+Results are written to benchmarks/results/<timestamp>.json; pass --compare to
+diff a run against the previous one (or a specific results file).
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenarios generate_mcq,youtube_braille --requests 50 --concurrency 8
+    python benchmarks/run_benchmarks.py --compare latest
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+sys.path.insert(0, BACKEND_DIR)
+
+import fixtures  # noqa: E402
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class RssSampler:
+    """Tracks the peak resident set size while a scenario runs."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, current_rss_kb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_kb = current_rss_kb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+
+class Scenario:
+    def __init__(self, name, method, path, build=None, query_string=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.build = build  # build(i) -> dict of test client kwargs
+        self.query_string = query_string
+
+    def request(self, client, i):
+        kwargs = self.build(i) if self.build else {}
+        if self.query_string:
+            kwargs["query_string"] = self.query_string
+        response = client.open(self.path, method=self.method, **kwargs)
+        response.get_data()  # drain streamed bodies
+        return response.status_code
+
+
+def build_scenarios(pdf_bytes, pptx_bytes, png_bytes, pdf_name):
+    return {
+        "rag_query": Scenario("rag_query", "POST", "/api/rag_query", lambda i: {
+            "json": {"query": "What does the document say about resistance?", "filename": pdf_name}}),
+        "upload_document": Scenario("upload_document", "POST", "/api/upload_document", lambda i: {
+            "data": {"file": (io.BytesIO(pdf_bytes), f"bench_{i}.pdf")},
+            "content_type": "multipart/form-data"}),
+        "translate_to_sign": Scenario("translate_to_sign", "POST", "/translate_to_sign", lambda i: {
+            "json": {"text": "this is my car"}}),
+        "upload_ppt": Scenario("upload_ppt", "POST", "/api/upload-ppt", lambda i: {
+            "data": {"file": (io.BytesIO(pptx_bytes), f"bench_{i}.pptx")},
+            "content_type": "multipart/form-data"}),
+        "scene_description": Scenario("scene_description", "POST", "/api/scene-description", lambda i: {
+            "data": {"image": (io.BytesIO(png_bytes), f"bench_{i}.png", "image/png")},
+            "content_type": "multipart/form-data"}),
+        "generate_mcq": Scenario("generate_mcq", "POST", "/api/generate-mcq", lambda i: {
+            "json": {"chapter_name": "Electricity"}}),
+        "youtube_braille": Scenario("youtube_braille", "GET", "/api/youtube-braille/",
+                                    query_string={"url": "https://youtu.be/benchmark01"}),
+    }
+
+
+def install_offline_stubs(transcript):
+    """Replace the non-LLM network calls with local stand-ins."""
+    from Common import tts
+    from YoutubeBraille import utils as braille_utils
+
+    braille_utils.YouTubeBrailleTranslator.get_video_transcript = lambda self, video_id: transcript
+    tts.set_engine("silent")
+
+
+def run_scenario(app, scenario, requests, concurrency):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(i):
+        nonlocal errors
+        client = app.test_client()
+        start = time.perf_counter()
+        try:
+            status = scenario.request(client, i)
+        except Exception as e:
+            print(f"  {scenario.name} request {i} raised: {e}")
+            status = 599
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+
+    # Warm-up request so model loading is not counted
+    scenario.request(app.test_client(), -1)
+
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(requests)))
+        wall = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2) if wall else 0.0,
+        "p50_ms": round(fixtures.percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(fixtures.percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(fixtures.percentile(latencies, 99) * 1000, 1),
+        "peak_rss_mb": round(rss.peak_kb / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{results['timestamp'].replace(':', '-')}.json")
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=4)
+    return path
+
+
+def load_baseline(compare, exclude=None):
+    if compare != "latest":
+        with open(compare) as baseline_file:
+            return json.load(baseline_file)
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    candidates = sorted(
+        os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR) if name.endswith(".json")
+    )
+    candidates = [path for path in candidates if path != exclude]
+    if not candidates:
+        return None
+    with open(candidates[-1]) as baseline_file:
+        return json.load(baseline_file)
+
+
+def print_comparison(results, baseline):
+    print(f"\nComparison against {baseline['timestamp']} (commit {baseline.get('git_commit')}):")
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "peak_rss_mb"):
+            if previous.get(key):
+                change = (current[key] - previous[key]) / previous[key] * 100
+                deltas.append(f"{key} {previous[key]} -> {current[key]} ({change:+.1f}%)")
+        print(f"  {name}: " + ", ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backend endpoints with a stubbed LLM")
+    parser.add_argument("--scenarios", default="all",
+                        help="comma separated scenario names, or 'all'")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="seconds to first token for the fake LLM")
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--pdf-pages", type=int, default=10)
+    parser.add_argument("--compare", help="'latest' or a path to an earlier results file")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+
+    # Run inside a scratch directory so uploads and generated media stay out of the tree
+    workdir = tempfile.mkdtemp(prefix="backend-bench-")
+    os.chdir(workdir)
+
+    from app import app
+    install_offline_stubs(fixtures.make_transcript(60))
+
+    pdf_bytes = fixtures.make_pdf(args.pdf_pages)
+    pdf_name = "bench_fixture.pdf"
+    with open(os.path.join(app.config['DOCUMENT_UPLOAD_FOLDER'], pdf_name), "wb") as pdf_file:
+        pdf_file.write(pdf_bytes)
+
+    scenarios = build_scenarios(pdf_bytes, fixtures.make_pptx(args.slides), fixtures.make_png(), pdf_name)
+    selected = list(scenarios) if args.scenarios == "all" else args.scenarios.split(",")
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "git_commit": git_commit(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "slides": args.slides,
+            "pdf_pages": args.pdf_pages,
+        },
+        "scenarios": {},
+    }
+    for name in selected:
+        print(f"Running {name}...")
+        results["scenarios"][name] = run_scenario(app, scenarios[name], args.requests, args.concurrency)
+        print(json.dumps(results["scenarios"][name], indent=4))
+
+    saved_path = None
+    if not args.no_save:
+        saved_path = save_results(results)
+        print(f"\nResults saved to {saved_path}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare, exclude=saved_path)
+        if baseline:
+            print_comparison(results, baseline)
+        else:
+            print("\nNo earlier results to compare against.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Entry point for serving the unified backend (app.py).
+
+SERVER_MODE=sync   Werkzeug threaded server, the same setup as `python app.py`.
+                   Every in-flight request holds an OS thread for the whole
+                   Gemini / transcript / gTTS round trip.
+SERVER_MODE=async  gevent server. The standard library is monkey-patched before
+                   the app is imported, so every request runs in a greenlet and
+                   blocking network calls (Gemini, YouTube transcripts, gTTS)
+                   yield to the event loop while they wait. One process can keep
+                   hundreds of requests in flight.
+
+Usage:
+    SERVER_MODE=async python serve.py
+"""
+import os
+
+SERVER_MODE = os.getenv("SERVER_MODE", "sync").lower()
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "5000"))
+# Upper bound on concurrently handled connections in async mode
+ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", "1000"))
+
+if SERVER_MODE == "async":
+    # Must run before anything imports socket, ssl or threading
+    from gevent import monkey
+    monkey.patch_all()
+
+    # google.generativeai talks gRPC by default, which only cooperates with
+    # gevent once its completion queue is driven by the gevent hub
+    try:
+        import grpc.experimental.gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+    except ImportError:
+        pass
+
+
+def run_sync():
+    from app import app
+    app.run(host=HOST, port=PORT, threaded=True)
+
+
+def run_async():
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+    from app import app
+
+    server = WSGIServer((HOST, PORT), app, spawn=Pool(ASYNC_MAX_CONNECTIONS))
+    print(f"Serving on http://{HOST}:{PORT} (async, max {ASYNC_MAX_CONNECTIONS} connections)")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    if SERVER_MODE == "async":
+        run_async()
+    elif SERVER_MODE == "sync":
+        run_sync()
+    else:
+        raise ValueError(f"Unknown SERVER_MODE: {SERVER_MODE} (expected 'sync' or 'async')")
@@ -0,0 +1,55 @@
+import json
+
+from MCQ_generator import parsing
+
+
+def question(options, answer, text="Which organism is a nematode?"):
+    return {"question": text, "options": options, "correct_answer": answer}
+
+
+def test_iter_objects_salvages_complete_objects_from_truncated_chunks():
+    first = question(["Worm", "Fly", "Yeast", "Mouse"], "A")
+    second = question(["One", "Two", "Three", "Four"], "B", text='A "quoted" {brace} question?')
+    text = "```json\n[" + json.dumps(first) + ", " + json.dumps(second) + ', {"question": "Cut off'
+    # Split mid-token, including inside strings and escapes
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+
+    assert list(parsing.iter_objects(chunks)) == [first, second]
+
+
+def test_strip_labels_when_all_four_options_are_labelled_in_order():
+    assert parsing._strip_labels(["A) one", "b. two", "(C) three", "Option D: four"]) == \
+        ["one", "two", "three", "four"]
+
+
+def test_strip_labels_keeps_options_that_only_look_labelled():
+    options = ["C. elegans", "D. melanogaster", "Mouse", "Yeast"]
+    assert parsing._strip_labels(options) == options
+
+
+def test_strip_labels_needs_the_labels_in_order():
+    options = ["B) one", "A) two", "C) three", "D) four"]
+    assert parsing._strip_labels(options) == options
+
+
+def test_answer_letter_accepts_letters_labels_and_option_text():
+    options = ["Worm", "Fly", "Yeast", "Mouse"]
+    for answer in ("b", "B", "Option B", "B)", "(B)", "Fly", "fly", "B) Fly"):
+        assert parsing._answer_letter(answer, options) == "B", answer
+    assert parsing._answer_letter("Elephant", options) is None
+    assert parsing._answer_letter(2, options) is None
+
+
+def test_answer_letter_matches_option_text_that_looks_labelled():
+    options = ["C. elegans", "Fly", "Yeast", "Mouse"]
+    assert parsing._answer_letter("C. elegans", options) == "A"
+
+
+def test_parse_questions_keeps_c_elegans_intact():
+    text = json.dumps([question(["C. elegans", "Fly", "Yeast", "Mouse"], "C. elegans")])
+    assert parsing.parse_questions(text) == [{
+        "topic": "",
+        "question": "Which organism is a nematode?",
+        "options": ["C. elegans", "Fly", "Yeast", "Mouse"],
+        "correct_answer": "A",
+    }]
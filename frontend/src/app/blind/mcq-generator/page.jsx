@@ -1,6 +1,5 @@
 "use client"
-import { useState, useEffect, useCallback } from 'react';  // Remove useRef
-import axios from 'axios';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
@@ -17,6 +16,10 @@ const MCQPage = () => {
     const [error, setError] = useState('');
     const [loading, setLoading] = useState(false);
     const [isListening, setIsListening] = useState(false); // Added state for listening
+    // True while questions are still arriving from the stream
+    const [streaming, setStreaming] = useState(false);
+    const mcqsRef = useRef([]);
+    const waitingForQuestion = useRef(false);
     const { speak } = useVoiceAssistance();  // Remove announce
 
     const handleGenerateMCQs = async () => {
@@ -31,24 +34,61 @@ const MCQPage = () => {
         speak("Generating MCQs, please wait...");
         setError('');
 
+        mcqsRef.current = [];
+        setMcqs([]);
+        setStreaming(true);
+
         try {
-            const response = await axios.post(
-                'http://127.0.0.1:5000/api/generate-mcq',  // Updated endpoint
-                { chapter_name: chapterName },
-                { 
-                    headers: { 
-                        'Content-Type': 'application/json'
-                    } 
+            // Questions arrive one per line, so the quiz can start on the first one
+            const response = await fetch('http://127.0.0.1:5000/api/generate-mcq?stream=1', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ chapter_name: chapterName }),
+            });
+
+            if (!response.ok || !response.body) {
+                const data = await response.json();
+                throw new Error(data.error || 'Failed to generate MCQs. Please try again.');
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop() || '';
+
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const message = JSON.parse(line);
+                    if (message.type === 'error') {
+                        throw new Error(message.error || 'Failed to generate MCQs. Please try again.');
+                    }
+                    if (message.type === 'question') {
+                        mcqsRef.current = [...mcqsRef.current, message.question];
+                        setMcqs(mcqsRef.current);
+                        if (mcqsRef.current.length === 1) {
+                            setLoading(false);
+                            speak(`Question 1: ${message.question.question}`);
+                        }
+                    }
                 }
-            );
-            setMcqs(response.data.answer_key);
-            speak("MCQs generated successfully. You can now review the questions.");
+            }
             setError('');
         } catch (err) {
-            const errorMsg = err.response?.data?.error || 'Failed to generate MCQs. Please try again.';
-            setError(errorMsg);
-            speak(errorMsg);
+            // Keep any questions that already arrived
+            if (!mcqsRef.current.length) {
+                const errorMsg = err.message || 'Failed to generate MCQs. Please try again.';
+                setError(errorMsg);
+                speak(errorMsg);
+            }
         } finally {
+            setStreaming(false);
             setLoading(false);
         }
     };
@@ -74,11 +114,13 @@ const MCQPage = () => {
             speak(`Incorrect. The correct answer was ${currentQuestion.correct_answer_option}`);
         }
 
-        if (currentQuestionIndex < mcqs.length - 1) {
+        if (currentQuestionIndex < mcqs.length - 1 || streaming) {
             setTimeout(() => {
                 setCurrentQuestionIndex(prev => prev + 1);
                 setSelectedOption('');
-                speak(`Next question: ${mcqs[currentQuestionIndex + 1].question}`);
+                const next = mcqsRef.current[currentQuestionIndex + 1];
+                waitingForQuestion.current = !next;
+                speak(next ? `Next question: ${next.question}` : "Loading the next question...");
             }, 2000);
         } else {
             setTimeout(() => {
@@ -133,9 +175,24 @@ const MCQPage = () => {
         recognition.start();
     };
 
+    // Announce a question that arrives while the student is waiting for it
+    useEffect(() => {
+        if (waitingForQuestion.current && mcqs[currentQuestionIndex]) {
+            waitingForQuestion.current = false;
+            speak(`Next question: ${mcqs[currentQuestionIndex].question}`);
+        }
+    }, [mcqs, currentQuestionIndex, speak]);
+
     // Render current question
     const renderCurrentQuestion = () => {
         const question = mcqs[currentQuestionIndex];
+        if (!question) {
+            return (
+                <div className="text-center p-6 text-lg" role="status">
+                    Loading the next question...
+                </div>
+            );
+        }
 
         return (
             <Card className="border-2 border-gray-200 hover:border-blue-300 transition-colors">
@@ -237,7 +294,7 @@ const MCQPage = () => {
                                 </div>
                             )}
                         </div>
-                    ) : showScore ? (
+                    ) : showScore || (!streaming && currentQuestionIndex >= mcqs.length) ? (
                         renderScore()
                     ) : (
                         renderCurrentQuestion()
@@ -28,6 +28,10 @@ const TopicLearnContent = () => {
   const isProcessingRef = useRef(false);
   const currentQueryRef = useRef("");
   const currentResponseRef = useRef("");
+  // Issued by the backend on the first follow-up; keys this conversation's context
+  const sessionIdRef = useRef(null);
+  // Set by Stop Audio so sentences still arriving from a stream are not spoken
+  const speechStoppedRef = useRef(false);
 
   const initializeSpeechRecognition = useCallback(() => {
     if (window.webkitSpeechRecognition) {
@@ -103,6 +107,85 @@ const TopicLearnContent = () => {
     });
   }, []);
 
+  // Queue one sentence behind whatever is already being spoken
+  const speakSentence = useCallback((text) => {
+    return new Promise((resolve) => {
+      if (speechStoppedRef.current) return resolve();
+
+      const utterance = new SpeechSynthesisUtterance(text);
+      utterance.lang = "en-US";
+
+      utterance.onstart = () => {
+        setIsPlaying(true);
+        setIsListening(false);
+        if (recognitionRef.current) {
+          recognitionRef.current.stop();
+        }
+      };
+      utterance.onend = resolve;
+      utterance.onerror = resolve;
+
+      window.speechSynthesis.speak(utterance);
+    });
+  }, []);
+
+  // Read an NDJSON answer stream, showing and speaking each sentence as it arrives.
+  // Resolves with the final "done" message once the last sentence has been spoken.
+  const streamAnswer = useCallback(async (url, body) => {
+    window.speechSynthesis.cancel();
+    speechStoppedRef.current = false;
+
+    const response = await fetch(`${url}?stream=1`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`HTTP error! Status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let spoken = Promise.resolve();
+    let result = null;
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop() || "";
+
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const message = JSON.parse(line);
+        if (message.type === "error") {
+          throw new Error(message.error || "Failed to get a response");
+        }
+        if (message.type === "sentence") {
+          spoken = speakSentence(message.text);
+          // Grow the latest AI entry sentence by sentence
+          setConversationHistory((prev) =>
+            prev.map((entry, index) =>
+              index === prev.length - 1
+                ? { ...entry, text: entry.text ? `${entry.text} ${message.text}` : message.text }
+                : entry
+            )
+          );
+        }
+        if (message.type === "done") {
+          result = message;
+        }
+      }
+    }
+
+    await spoken;
+    setIsPlaying(false);
+    return result;
+  }, [speakSentence]);
+
   useEffect(() => {
     const recognition = initializeSpeechRecognition();
     recognitionRef.current = recognition;
@@ -121,31 +204,24 @@ const TopicLearnContent = () => {
       // Set initial topic in ref
       currentQueryRef.current = topic;
 
-      fetch("http://127.0.0.1:5000/api/get_response", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ topic }),
-      })
-        .then((res) => res.json())
+      setConversationHistory([
+        { type: "user", text: topic },
+        { type: "ai", text: "" },
+      ]);
+
+      streamAnswer("http://127.0.0.1:5000/api/get_response", { topic })
         .then((data) => {
-          const response = data.response;
           // Store the response in ref
-          currentResponseRef.current = response;
-          setConversationHistory([
-            { type: "user", text: topic },
-            { type: "ai", text: response },
-          ]);
-
-          playTextToSpeech(response).then(() => {
-            setIsListening(true);
-            if (recognitionRef.current) {
-              recognitionRef.current.start();
-            }
-          });
+          currentResponseRef.current = data ? data.response : "";
+
+          setIsListening(true);
+          if (recognitionRef.current) {
+            recognitionRef.current.start();
+          }
         })
         .catch(console.error);
     }
-  }, [topic, playTextToSpeech]);
+  }, [topic, streamAnswer]);
 
   const handleQuerySubmission = async (query) => {
     if (isProcessingRef.current) return;
@@ -162,40 +238,28 @@ const TopicLearnContent = () => {
 
     setTranscript("");
 
-    // Add user query to conversation history immediately
-    setConversationHistory((prev) => [...prev, { type: "user", text: query }]);
+    // Add user query to conversation history immediately; the answer fills in as it streams
+    setConversationHistory((prev) => [
+      ...prev,
+      { type: "user", text: query },
+      { type: "ai", text: "" },
+    ]);
 
     try {
-      const response = await fetch("http://127.0.0.1:5000/api/ask_more", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          previous_query: currentQueryRef.current,
-          previous_response: currentResponseRef.current,
-          query: query,
-        }),
+      const data = await streamAnswer("http://127.0.0.1:5000/api/ask_more", {
+        previous_query: currentQueryRef.current,
+        previous_response: currentResponseRef.current,
+        query: query,
+        session_id: sessionIdRef.current,
       });
 
-      if (!response.ok) {
-        throw new Error(`HTTP error! Status: ${response.status}`);
+      if (data) {
+        sessionIdRef.current = data.session_id;
+        // Update refs with new context
+        currentQueryRef.current = query;
+        currentResponseRef.current = data.info;
       }
 
-      const data = await response.json();
-      const aiResponse = data.info;
-
-      // Update refs with new context
-      currentQueryRef.current = query;
-      currentResponseRef.current = aiResponse;
-
-      // Add AI response to conversation history
-      setConversationHistory(
-        (prev) => [...prev, { type: "ai", text: aiResponse }]
-      );
-
-      await playTextToSpeech(aiResponse);
-
       setIsListening(true);
       if (recognitionRef.current) {
         recognitionRef.current.start();
@@ -225,6 +289,7 @@ const TopicLearnContent = () => {
 
   const handleStopAudio = () => {
     // Cancel the speech synthesis to stop any ongoing speech
+    speechStoppedRef.current = true;
     window.speechSynthesis.cancel();
 
     // Immediately start listening
@@ -237,6 +302,7 @@ const TopicLearnContent = () => {
 
   const handleQuitConversation = () => {
     // Complete stop of all audio and recognition
+    speechStoppedRef.current = true;
     window.speechSynthesis.cancel();
     if (recognitionRef.current) {
       recognitionRef.current.stop();
@@ -7,7 +7,11 @@ export default function PPTViewer() {
     const [isPlaying, setIsPlaying] = useState(false);
     const [error, setError] = useState(null);
     const [loading, setLoading] = useState(false);
+    const [video, setVideo] = useState(null);
     const audioRef = useRef(null);
+    const fileRef = useRef(null);
+    // Every slide received so far, by slide number, including ones not shown yet
+    const receivedRef = useRef({});
 
     const handleFileUpload = async (e) => {
         const file = e.target.files[0];
@@ -18,19 +22,54 @@ export default function PPTViewer() {
         const formData = new FormData();
         formData.append('file', file);
 
+        setSlides([]);
+        receivedRef.current = {};
+        setCurrentSlide(0);
+        setVideo(null);
+        fileRef.current = file;
+
         try {
-            const response = await fetch('http://127.0.0.1:5000/api/upload-ppt', {
+            // Slides are streamed as NDJSON as soon as each one is ready
+            const response = await fetch('http://127.0.0.1:5000/api/upload-ppt?stream=1', {
                 method: 'POST',
                 body: formData,
             });
-            
-            const data = await response.json();
-            if (!response.ok) {
+
+            if (!response.ok || !response.body) {
+                const data = await response.json();
                 throw new Error(data.error || 'Failed to process PPT');
             }
-            
-            setSlides(data.slides);
-            setCurrentSlide(0);
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop() || '';
+
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const message = JSON.parse(line);
+                    if (message.type === 'error') {
+                        throw new Error(message.error || 'Failed to process PPT');
+                    }
+                    if (message.type === 'slide') {
+                        // Slides can finish out of order. Only show the unbroken run from slide 1,
+                        // so a slide never moves to another index while it is being viewed
+                        receivedRef.current[message.slide_no] = message;
+                        const ready = [];
+                        while (receivedRef.current[ready.length + 1]) {
+                            ready.push(receivedRef.current[ready.length + 1]);
+                        }
+                        setSlides(ready);
+                    }
+                }
+            }
         } catch (error) {
             setError(error.message);
             console.error('Error:', error);
@@ -39,6 +78,35 @@ export default function PPTViewer() {
         }
     };
 
+    const renderVideo = async () => {
+        if (!fileRef.current) return;
+        setError(null);
+        const formData = new FormData();
+        formData.append('file', fileRef.current);
+
+        try {
+            const response = await fetch('http://127.0.0.1:5000/api/ppt-video', {
+                method: 'POST',
+                body: formData,
+            });
+            let job = await response.json();
+            if (!response.ok) throw new Error(job.error || 'Failed to start video rendering');
+
+            // Rendering runs in the background; poll until it finishes
+            setVideo(job);
+            while (job.status === 'queued' || job.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                const status = await fetch(`http://127.0.0.1:5000/api/ppt-video/${job.job_id}`);
+                job = await status.json();
+                setVideo(job);
+            }
+            if (job.status === 'error' || job.status === 'expired') throw new Error(job.error || 'Video rendering failed');
+        } catch (error) {
+            setError(error.message);
+            console.error('Error:', error);
+        }
+    };
+
     const playAudio = () => {
         if (!slides[currentSlide]?.audio_url) return;
         audioRef.current = new Audio(`http://127.0.0.1:5000${slides[currentSlide].audio_url}`);
@@ -88,7 +156,7 @@ export default function PPTViewer() {
                 </div>
             )}
 
-            {slides.length > 0 && !loading && (
+            {slides.length > 0 && (
                 <div className="flex flex-col items-center">
                     <img
                         src={`http://127.0.0.1:5000${slides[currentSlide].image_url}`}
@@ -134,6 +202,42 @@ export default function PPTViewer() {
                         <h3 className="font-bold mb-2">Script:</h3>
                         <p>{slides[currentSlide].script}</p>
                     </div>
+
+                    <div className="w-full max-w-3xl mt-4">
+                        {!video || video.status === 'error' || video.status === 'expired' ? (
+                            <button
+                                onClick={renderVideo}
+                                disabled={loading}
+                                className="px-4 py-2 bg-purple-500 text-white rounded disabled:opacity-50"
+                            >
+                                Create Video
+                            </button>
+                        ) : video.status === 'done' ? (
+                            <div className="flex flex-col gap-2">
+                                <video
+                                    src={`http://127.0.0.1:5000${video.video_url}`}
+                                    controls
+                                    className="w-full"
+                                />
+                                <a
+                                    href={`http://127.0.0.1:5000${video.download_url}`}
+                                    className="text-blue-600 underline"
+                                >
+                                    Download MP4
+                                </a>
+                            </div>
+                        ) : (
+                            <div>
+                                <p className="mb-1">Rendering video... {video.progress}%</p>
+                                <div className="w-full bg-gray-200 rounded h-2">
+                                    <div
+                                        className="bg-purple-500 h-2 rounded"
+                                        style={{ width: `${video.progress}%` }}
+                                    />
+                                </div>
+                            </div>
+                        )}
+                    </div>
                 </div>
             )}
         </div>